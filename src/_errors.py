@@ -9,4 +9,11 @@ class IncorrectInstallError(Exception):
             "- Delete current project/directory (`nba-props`).",
             "- Re-try with the installation instructions in the README.md."
         ], '')
-        super.__init__(ERR_MSG)
\ No newline at end of file
+        super.__init__(ERR_MSG)
+
+class ScrapeRequestError(Exception):
+    """If a page could not be fetched after all retries"""
+    def __init__(self, url: str, reason: str):
+        self.url = url
+        self.reason = reason
+        super().__init__(f"Failed to fetch {url}: {reason}")
@@ -0,0 +1,161 @@
+import os
+import json
+import time
+import datetime
+import threading
+import contextlib
+import collections
+from dataclasses import dataclass, field
+
+from designs import DATA_DIR
+from _utils import _atomic_write
+
+# data/metrics/{date}.jsonl (one line per span/counter bump, dated by the event) + data/metrics/props.prom (latest totals)
+METRICS_DIR = os.path.join(DATA_DIR, 'metrics')
+
+# Pipeline stages timed by METRICS.span, in the order a scrape cycle runs them (background_write: _writer thread)
+STAGES = ['directory_fetch', 'fetch', 'parse', 'projection', 'post_processing', 'tracker_write', 'export', 'background_write']
+
+# Counters bumped by METRICS.incr
+COUNTERS = {
+    'scrape_failures': 'Player pages that could not be fetched after all retries',
+    'fallback_date': 'Props tables taken from a fallback (non-current) date',
+    'empty_results': "Players scraped without any usable props ('---')",
+    'cycles': 'Scrape cycles completed',
+}
+
+
+@dataclass
+class Metrics:
+    """
+    Per-stage timings and event counters for the scrape pipeline
+    - span(stage): context manager, every call becomes one JSONL event + feeds the stage totals
+    - incr(counter): bumps a counter, also logged as an event
+    - Events are buffered in memory and written out by flush (once per scrape cycle), so per-player
+        spans never touch the disk from inside the fetch threads
+    - Buffer holds the last max_events, older ones are dropped (and counted) when nothing flushes,
+        stage totals and counters are unaffected
+    - No jsonl_path -> each event goes to the file for the day it happened, so long runs roll over at midnight
+    - Prometheus text file is rewritten atomically on flush with running totals since process start
+    """
+    jsonl_path: str|None = None
+    prom_path: str|None = None
+    enabled: bool = True
+    max_events: int = 50_000
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        if not self.prom_path:
+            self.prom_path = os.path.join(METRICS_DIR, 'props.prom')
+
+        self.counters = {counter: 0 for counter in COUNTERS}
+        self.stage_seconds = {stage: 0.0 for stage in STAGES}
+        self.stage_counts = {stage: 0 for stage in STAGES}
+        self.stage_errors = {stage: 0 for stage in STAGES}
+        self._events = collections.deque(maxlen=self.max_events)
+        self.dropped_events = 0
+
+    def _event(self, event: dict) -> None:
+        if len(self._events) == self._events.maxlen:
+            self.dropped_events += 1
+        self._events.append({'ts': datetime.datetime.now().isoformat(timespec='milliseconds'), **event})
+        return
+
+    def _jsonl_path(self, event: dict) -> str:
+        return self.jsonl_path or os.path.join(METRICS_DIR, f'{event["ts"][:10]}.jsonl')
+
+    @contextlib.contextmanager
+    def span(self, stage: str, **labels):
+        """Times the block as one span of stage, labels (player, site, rows, ...) go into the JSONL event"""
+        if not self.enabled:
+            yield
+            return
+
+        start = time.perf_counter()
+        ok = True
+        try:
+            yield
+        except BaseException:
+            ok = False
+            raise
+        finally:
+            seconds = time.perf_counter() - start
+            with self._lock:
+                self.stage_seconds[stage] = self.stage_seconds.get(stage, 0.0) + seconds
+                self.stage_counts[stage] = self.stage_counts.get(stage, 0) + 1
+                if not ok:
+                    self.stage_errors[stage] = self.stage_errors.get(stage, 0) + 1
+                self._event({'type': 'span', 'stage': stage, 'seconds': round(seconds, 6), 'ok': ok, **labels})
+
+    def incr(self, counter: str, n: int = 1, **labels) -> None:
+        if not self.enabled:
+            return
+        with self._lock:
+            self.counters[counter] = self.counters.get(counter, 0) + n
+            self._event({'type': 'counter', 'counter': counter, 'n': n, **labels})
+        return
+
+    def summary(self) -> dict[str, float]:
+        """Running totals, same numbers as the Prometheus file"""
+        with self._lock:
+            return {
+                **{counter: value for counter, value in self.counters.items()},
+                **{f'{stage}_seconds': round(seconds, 3) for stage, seconds in self.stage_seconds.items()},
+                **{f'{stage}_count': count for stage, count in self.stage_counts.items()},
+                'dropped_events': self.dropped_events,
+            }
+
+    def prometheus(self) -> str:
+        """Totals in Prometheus text exposition format (node_exporter textfile collector can pick it up)"""
+        with self._lock:
+            stage_seconds, stage_counts = dict(self.stage_seconds), dict(self.stage_counts)
+            stage_errors, counters = dict(self.stage_errors), dict(self.counters)
+
+        lines = [
+            '# HELP nba_props_stage_seconds Time spent in each scrape pipeline stage',
+            '# TYPE nba_props_stage_seconds summary',
+        ]
+        for stage in stage_seconds:
+            lines.append(f'nba_props_stage_seconds_sum{{stage="{stage}"}} {stage_seconds[stage]:.6f}')
+            lines.append(f'nba_props_stage_seconds_count{{stage="{stage}"}} {stage_counts[stage]}')
+
+        lines += [
+            '# HELP nba_props_stage_errors_total Spans that ended in an exception',
+            '# TYPE nba_props_stage_errors_total counter',
+        ]
+        lines += [f'nba_props_stage_errors_total{{stage="{stage}"}} {count}' for stage, count in stage_errors.items()]
+
+        for counter, value in counters.items():
+            lines += [
+                f'# HELP nba_props_{counter}_total {COUNTERS.get(counter, counter)}',
+                f'# TYPE nba_props_{counter}_total counter',
+                f'nba_props_{counter}_total {value}',
+            ]
+
+        return '\n'.join(lines) + '\n'
+
+    def flush(self) -> int:
+        """Appends buffered events to the JSONL log and rewrites the Prometheus file, returns events written"""
+        if not self.enabled:
+            return 0
+
+        with self._lock:
+            events, self._events = self._events, collections.deque(maxlen=self.max_events)
+
+        by_path = {}
+        for event in events:
+            by_path.setdefault(self._jsonl_path(event), []).append(event)
+
+        for path, path_events in by_path.items():
+            os.makedirs(os.path.dirname(path), exist_ok=True)
+            with open(path, 'a') as f:
+                f.write(''.join(f'{json.dumps(event, default=str)}\n' for event in path_events))
+
+        os.makedirs(os.path.dirname(self.prom_path), exist_ok=True)
+
+        _atomic_write(self.prom_path, self.prometheus().encode())
+        return len(events)
+
+
+# Process wide registry, scraper and handler report into this one
+METRICS = Metrics()
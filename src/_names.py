@@ -0,0 +1,42 @@
+import os
+import json
+import functools
+import unidecode
+import pandas as pd
+
+# Site/source spelling -> standard spelling used everywhere else
+# Keys are matched after unidecode, so accents don't need separate entries
+NAME_ALIASES_FILE = os.path.join(os.path.dirname(os.path.abspath(__file__)), '..', 'data', 'name-aliases.json')
+
+
+def _load_name_aliases(path: str = NAME_ALIASES_FILE) -> dict[str,str]:
+    if not os.path.exists(path):
+        return {}
+    with open(path, 'r') as f:
+        return {unidecode.unidecode(alias): name for alias, name in json.load(f).items()}
+
+NAME_ALIASES = _load_name_aliases()
+
+
+def _set_name_aliases(path: str = NAME_ALIASES_FILE) -> None:
+    """Reload alias table (e.g. after editing data/name-aliases.json mid-session), drops cached results"""
+    NAME_ALIASES.clear()
+    NAME_ALIASES.update(_load_name_aliases(path))
+    _clean_name.cache_clear()
+    return
+
+
+@functools.lru_cache(maxsize=8192)
+def _clean_name(name: str) -> str:
+    """Clean player name to standard format: alias table, else first two words, ascii, no periods"""
+    alias = NAME_ALIASES.get(unidecode.unidecode(name))
+    if alias is not None:
+        return alias.strip()
+
+    return unidecode.unidecode(" ".join(name.split(" ")[:2]).replace(".", "")).strip()
+
+
+def _clean_names(names: pd.Series) -> pd.Series:
+    """Vectorized _clean_name, each distinct name only cleaned once"""
+    uniques = names.drop_duplicates()
+    return names.map(dict(zip(uniques, map(_clean_name, uniques))))
@@ -1,84 +1,41 @@
+import io
+import os
 import time
+import builtins
+import tempfile
 import datetime
 import functools
-import unidecode
 import pandas as pd
-import matplotlib.pyplot as plt
-import seaborn as sns
 from typing import Any, Callable
 
+from _names import _clean_name, _clean_names
 
-def _clean_name(name: str) -> str:
-    return {
-        'Alex Sarr': 'Alexandre Sarr',
-        'Carlton Carrington': 'Bub Carrington',
-        "Day'ron Sharpe": "Day'Ron Sharpe",
-        'Egor Diomin': 'Egor Demin',
-        'GG Jackson': 'Gregory Jackson',
-        'Kenneth Simpson': 'KJ Simpson',
-        "Lu Dort": "Luguentz Dort",
-        "Moe Wagner": "Moritz Wagner",
-        "Robert Dillingham": "Rob Dillingham",
-        'Ron Holland': 'Ronald Holland',
-        'Tristan Da Silva': 'Tristan Da Silva',
-        'Tristan da Silva': 'Tristan Da Silva',
-        # 'Hansen Yang': 'Yang Hansen',
-        'Yang Hansen': 'Hansen Yang'
-    }.get(
-        unidecode.unidecode(name),
-        unidecode.unidecode(" ".join(name.split(" ")[:2]).replace(".", ""))
-    ).strip()
 
 def _clean_team(team: str) -> str:
     """Clean player name to standard format."""
     return {'GSW': 'GS', 'SAS': 'SA', 'NOP': 'NO', 'PHX': 'PHO', 'NYK': 'NY'}.get(team, team).strip()
 
+def _clean_teams(teams: pd.Series) -> pd.Series:
+    """Vectorized _clean_team, each distinct abbreviation only cleaned once"""
+    uniques = teams.drop_duplicates()
+    return teams.map(dict(zip(uniques, map(_clean_team, uniques))))
+
 def _load_injuries(
-    fanduel_contest_data_path: str = f'/home/deegs/devel/repos/nba-boxscores-git/nba-boxscores/data/2025-2026/contest-files/fanduel/main-slate/{datetime.date.today().isoformat()}.csv',
+    fanduel_contest_data_path: str|None = None, # Default prophandler.injuries.INJURY_FILE
     report: bool = False, # Verbose flag
     drop: list[str,...]|None = None
 ) -> list[str,...]:
     """
     Load injured players from FanDuel contest file
     Returns both Out players and Doubtful players
+    - One-off read through prophandler.injuries.InjuryFeed, which PropHandler keeps re-checking during constant scrapes
     """
-    abbreviations = {'GTD': 'Game-time Decision', 'P': 'Probable', 'Q': 'Questionable', 'D': 'Doubtful', 'O': 'Out'}
+    from prophandler.injuries import InjuryFeed
 
-    if not drop:
-        drop = []
-    
-    df = (pd
-          .read_csv(fanduel_contest_data_path)
-          [['Nickname', 'Played', 'Salary', 'Team', 'FPPG', 'Injury Indicator']]
-          .set_axis(['name', 'n_games', 'salary', 'team', 'fpts', 'status'], axis=1)
-          .assign(
-              name=lambda df_: df_.name.apply(_clean_name),
-              fpts_1k=lambda df_: 1_000 * (df_.fpts / df_.salary),
-              status=lambda df_: df_.status.map(lambda status_: status_.strip() if isinstance(status_, str) else status_)
-          )
-          # .pipe(lambda df_: df_.loc[(df_.salary > 3_500)])
-          .pipe(lambda df_: df_.loc[((df_.salary > 4_000) | (df_.fpts >= 20.0)) & ((df_.n_games >= 10) & (df_.fpts_1k <= 6.0))])
-          .set_index('name')
-         )
-    
-    injuries = {status: sorted(df.loc[df.status == status].index, key=lambda name_: df.loc[name_, 'salary'], reverse=True) for status in abbreviations}
-
-    if report:
-        report_msgs = []
-        report_players = {status: {team: sorted(df.loc[(df.status == status) & (df.team == team)].index, key=lambda name_: df.loc[name_, 'salary'], reverse=True) for team in df.team.drop_duplicates()} for status in abbreviations}
-        for status, team_players in report_players.items():
-            if any(team_players.values()):
-                report_msgs.append(f'{abbreviations[status]}:')
-                for team, players in team_players.items():
-                    if players:
-                        report_msgs.extend(sum([
-                            [f' * {team}:'],
-                            [f'    - {_clean_name(p)}' for p in players]
-                        ], []))
-
-        _output_msgs(report_msgs, char='*')
-    
-    return sorted(injuries['O'] + injuries['D'])
+    feed = InjuryFeed(path=fanduel_contest_data_path, report=report)
+    feed.refresh()
+
+    return feed.out
 
 def _output_msgs(msgs: str|list[str,...], char=None, warning=False) -> None:
     """
@@ -100,6 +57,45 @@ def _output_msgs(msgs: str|list[str,...], char=None, warning=False) -> None:
     
     return
 
+# Process umask read once at import (reading it means setting it), mkstemp's 0600 is widened back to it
+_UMASK = os.umask(0)
+os.umask(_UMASK)
+
+def _atomic_write(path: str, data: bytes) -> None:
+    """Write to temp file in same directory then rename so readers never see partial files, usual umask permissions"""
+    fd, tmp_path = tempfile.mkstemp(dir=os.path.dirname(path), prefix='.tmp-')
+    try:
+        with os.fdopen(fd, 'wb') as f:
+            f.write(data)
+        os.chmod(tmp_path, 0o666 & ~_UMASK)
+        os.replace(tmp_path, path)
+    except BaseException:
+        if os.path.exists(tmp_path):
+            os.remove(tmp_path)
+        raise
+    return
+
+
+def _parquet_bytes(df: pd.DataFrame, **kwargs) -> bytes:
+    """df.to_parquet into memory, for _atomic_write"""
+    buffer = io.BytesIO()
+    df.to_parquet(buffer, **kwargs)
+    return buffer.getvalue()
+
+
+def _display(obj: Any) -> None:
+    """
+    - Rich display inside Jupyter (IPython puts display() into builtins)
+    - Plain print anywhere else, i.e. cli / cron / containers
+    """
+    display_ = getattr(builtins, 'display', None)
+    if display_:
+        return display_(obj)
+
+    print(obj.to_string() if isinstance(obj, pd.DataFrame) else obj)
+    return
+
+
 def _timeit(func: Callable[[Any], Any], *args, **kwargs) -> Callable[[Any], Any]:
     """
     Will be used as decorator to output time it taks for func to complete.
@@ -0,0 +1,125 @@
+import atexit
+import threading
+import pandas as pd
+from typing import Callable
+from dataclasses import dataclass, field
+
+from _metrics import METRICS
+from _utils import _atomic_write, _output_msgs, _parquet_bytes
+
+
+@dataclass
+class _Job:
+    """One frame headed for one or more paths, serialized the first time any of them is written"""
+    serialize: Callable[[], bytes]
+    data: bytes|None = None
+
+    def payload(self) -> bytes:
+        if self.data is None:
+            self.data = self.serialize()
+        return self.data
+
+
+@dataclass
+class WriteBehind:
+    """
+    Background writer for output CSVs, archive + tracker parquet files and private exports
+    - submit(paths, serialize) returns straight away, one thread does the serializing and writing
+    - Each frame serialized once however many paths it goes to, every file written atomically (temp file + rename)
+    - Pending writes keyed by path: a newer frame for a path replaces the one still waiting, so only the latest lands
+    - Bounded: submit blocks once max_pending frames are waiting, memory can't grow if the disk stalls for good
+    - Failed writes are warned about and counted, they never reach the scrape loop
+    - flush() waits for everything submitted so far (runs at exit too), background=False writes inline instead
+    """
+    max_pending: int = 16
+    background: bool = True
+    _cond: threading.Condition = field(default_factory=threading.Condition, repr=False)
+
+    def __post_init__(self):
+        self._pending = {}
+        self._writing = None
+        self._thread = None
+        self.written = 0
+        self.coalesced = 0
+        self.failed = 0
+
+    def _write(self, path: str, job: _Job) -> None:
+        try:
+            with METRICS.span('background_write', path=path):
+                _atomic_write(path, job.payload())
+            self.written += 1
+        except Exception as err:
+            self.failed += 1
+            _output_msgs([f'Background write to {path} failed: {err!r}'], warning=True)
+        return
+
+    def _run(self) -> None:
+        while True:
+            with self._cond:
+                while not self._pending:
+                    self._cond.wait()
+                path = next(iter(self._pending))
+                job = self._pending.pop(path)
+                self._writing = path
+
+            self._write(path, job)
+
+            with self._cond:
+                self._writing = None
+                self._cond.notify_all()
+
+    def _start(self) -> None:
+        if self._thread is None or not self._thread.is_alive():
+            self._thread = threading.Thread(target=self._run, name='write-behind', daemon=True)
+            self._thread.start()
+        return
+
+    def submit(self, paths: list[str,...], serialize: Callable[[], bytes]) -> None:
+        """Queues serialize() output for every path, replacing anything still pending for those paths"""
+        job = _Job(serialize)
+        if not self.background:
+            for path in paths:
+                self._write(path, job)
+            return
+
+        with self._cond:
+            self._start()
+            # Only frames that add to the backlog wait for room, replacing a pending one never does
+            if not any(path in self._pending for path in paths):
+                self._cond.wait_for(lambda: len({id(job_) for job_ in self._pending.values()}) < self.max_pending)
+
+            for path in paths:
+                if self._pending.pop(path, None) is not None:
+                    self.coalesced += 1
+                self._pending[path] = job
+            self._cond.notify_all()
+        return
+
+    def write_csv(self, df: pd.DataFrame, paths: list[str,...], **kwargs) -> None:
+        """df.to_csv(path, **kwargs) for every path, frame copied so the caller can keep changing it"""
+        frame = df.copy()
+        self.submit(paths, lambda: frame.to_csv(**kwargs).encode())
+        return
+
+    def write_parquet(self, df: pd.DataFrame, paths: list[str,...], **kwargs) -> None:
+        """df.to_parquet(path, **kwargs) for every path, frame copied so the caller can keep changing it"""
+        frame = df.copy()
+        self.submit(paths, lambda: _parquet_bytes(frame, **kwargs))
+        return
+
+    def pending(self) -> list[str,...]:
+        with self._cond:
+            return list(self._pending) + ([self._writing] if self._writing else [])
+
+    def flush(self, timeout: float|None = None) -> bool:
+        """Blocks until every submitted write is on disk, False if timeout ran out first"""
+        with self._cond:
+            return self._cond.wait_for(lambda: not self._pending and self._writing is None, timeout=timeout)
+
+    def summary(self) -> dict[str, int]:
+        return {'written': self.written, 'coalesced': self.coalesced, 'failed': self.failed, 'pending': len(self.pending())}
+
+
+# Process wide writer, every handler/archive/tracker queues onto this one
+WRITER = WriteBehind()
+atexit.register(WRITER.flush)
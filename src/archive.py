@@ -0,0 +1,143 @@
+import os
+import glob
+import pandas as pd
+from dataclasses import dataclass
+
+from designs import DATA_DIR, CONTEST_DATE_STR
+from _writer import WriteBehind
+from _utils import _atomic_write, _parquet_bytes
+
+# data/archive/site={site}/mode={mode}/date={date}.parquet + index.parquet alongside
+ARCHIVE_DIR = os.path.join(DATA_DIR, 'archive')
+
+ARCHIVE_COLUMNS = ['name', 'pos', 'salary', 'team', 'opp', 'fpts', 'e_fpts', 'props', 'open', 'e_open', 'movement', 'e_movement']
+
+INDEX_COLUMNS = ['count', 'fpts_sum', 'e_fpts_sum', 'fpts_mean', 'e_fpts_mean', 'fpts_last_n', 'last_date', 'recent_dates', 'recent_fpts']
+
+
+def _write_parquet(path: str, df: pd.DataFrame, writer: WriteBehind|None = None) -> None:
+    if writer is None:
+        _atomic_write(path, _parquet_bytes(df))
+    else:
+        writer.write_parquet(df, [path])
+    return
+
+
+@dataclass
+class HistoricalArchive:
+    """
+    Final projections for every slate, partitioned by site, mode and date
+    - One parquet file per (site, mode, date), rewritten whenever that day's slate is rescraped
+    - Per-player aggregate index (count, sums, means, last N values) kept next to it
+    - Index updated incrementally on write: only the day being written is read back, so writes
+        and lookups cost the same on opening night and in April
+    - writer: files go through a WriteBehind, days written this session are read back from memory
+        so a write still queued is never double counted
+    """
+    site: str = 'draftkings'
+    mode: str = 'classic'
+    last_n: int = 10
+    writer: WriteBehind|None = None
+
+    def __post_init__(self):
+        self.source = os.path.join(ARCHIVE_DIR, f'site={self.site}', f'mode={self.mode}')
+        self.index_path = os.path.join(self.source, 'index.parquet')
+        self._index = None
+        self._written = {}
+
+    def _path(self, date_str: str) -> str:
+        return os.path.join(self.source, f'date={date_str}.parquet')
+
+    def __contains__(self, date_str: str) -> bool:
+        return date_str in self._written or os.path.exists(self._path(date_str))
+
+    def dates(self) -> list[str,...]:
+        return sorted(set(self._written) | {
+            os.path.basename(path).removeprefix('date=').removesuffix('.parquet')
+            for path in glob.glob(os.path.join(self.source, 'date=*.parquet'))
+        })
+
+    def read(self, date_str: str = CONTEST_DATE_STR) -> pd.DataFrame:
+        if date_str in self._written:
+            return self._written[date_str].copy()
+        if date_str not in self:
+            return pd.DataFrame(columns=ARCHIVE_COLUMNS).set_index('name')
+        return pd.read_parquet(self._path(date_str))
+
+    def index(self) -> pd.DataFrame:
+        """Per player aggregates over every archived date, indexed by name"""
+        if self._index is None:
+            self._index = (
+                pd.read_parquet(self.index_path)
+                if os.path.exists(self.index_path)
+                else pd.DataFrame(columns=INDEX_COLUMNS, index=pd.Index([], name='name'))
+            )
+        return self._index
+
+    def write(self, df: pd.DataFrame, date_str: str = CONTEST_DATE_STR) -> None:
+        """
+        Files a slate (indexed by name) for date_str and folds it into the index
+        - Same date written again (constant scrape) replaces that date's contribution
+        """
+        os.makedirs(self.source, exist_ok=True)
+        new = df.reindex(ARCHIVE_COLUMNS[1:], axis=1).rename_axis('name')
+        old = self.read(date_str)
+
+        index = self.index()
+        totals = (
+            index[['count', 'fpts_sum', 'e_fpts_sum']].astype('float64')
+            .sub(old[['fpts', 'e_fpts']].astype('float64').set_axis(['fpts_sum', 'e_fpts_sum'], axis=1).assign(count=1.0), fill_value=0.0)
+            .add(new[['fpts', 'e_fpts']].astype('float64').set_axis(['fpts_sum', 'e_fpts_sum'], axis=1).assign(count=1.0), fill_value=0.0)
+        )
+
+        recent_dates = index.recent_dates.to_dict()
+        recent_fpts = index.recent_fpts.to_dict()
+        new_fpts = new.fpts.to_dict()
+        for name in old.index.union(new.index):
+            pairs = {
+                date_: fpts_
+                for date_, fpts_ in zip(recent_dates.get(name, []), recent_fpts.get(name, []))
+                if date_ != date_str
+            }
+            if name in new_fpts:
+                pairs[date_str] = float(new_fpts[name])
+            pairs = sorted(pairs.items())[-self.last_n:]
+            recent_dates[name] = [date_ for date_, _ in pairs]
+            recent_fpts[name] = [fpts_ for _, fpts_ in pairs]
+
+        totals = totals.loc[totals['count'] > 0]
+        self._index = (totals
+            .assign(
+                count=lambda df_: df_['count'].round().astype('int'),
+                fpts_mean=lambda df_: df_.fpts_sum / df_['count'],
+                e_fpts_mean=lambda df_: df_.e_fpts_sum / df_['count'],
+                recent_dates=lambda df_: df_.index.map(lambda name_: list(recent_dates.get(name_, []))),
+                recent_fpts=lambda df_: df_.index.map(lambda name_: list(recent_fpts.get(name_, []))),
+                fpts_last_n=lambda df_: df_.recent_fpts.map(lambda values_: sum(values_) / len(values_) if values_ else 0.0),
+                last_date=lambda df_: df_.recent_dates.map(lambda dates_: dates_[-1] if dates_ else ''),
+            )
+            .reindex(INDEX_COLUMNS, axis=1)
+            .rename_axis('name')
+        )
+
+        if self.writer is not None:
+            self._written[date_str] = new
+        _write_parquet(self._path(date_str), new, self.writer)
+        _write_parquet(self.index_path, self._index, self.writer)
+        return
+
+    def means(self, value: str = 'fpts') -> dict[str, float]:
+        """Mean projection per player across all archived dates, value: fpts | e_fpts | fpts_last_n"""
+        column = value if value.endswith('_last_n') else f'{value}_mean'
+        return self.index()[column].to_dict()
+
+    def import_csvs(self, paths: list[str,...]) -> int:
+        """One-off import of old data/historical/{date}.csv files, returns number imported"""
+        imported = 0
+        for path in sorted(paths):
+            date_str = os.path.basename(path).removesuffix('.csv')
+            if date_str in self:
+                continue
+            self.write(pd.read_csv(path).set_index('name'), date_str)
+            imported += 1
+        return imported
@@ -4,6 +4,9 @@ import json
 
 import pandas as pd
 
+from designs import DATA_DIR
+from archive import HistoricalArchive
+
 def read_json_file(file: str) -> dict[str,float]:
     proj = dict()
     with open(file, 'r') as f:
@@ -53,11 +56,14 @@ def load_backup_projections(**kwargs) -> dict[str,float]:
         'csv': load_csv_projections,
     }[files[0].split('.')[-1]](files)
 
-def create_historical_props():
-    return (pd
-            .concat([pd.read_csv(f) for f in glob.glob('/home/deegs/devel/repos/nba-props-git/nba-props/data/historical/*.csv')])
-            .groupby('name')
-            ['fpts']
-            .agg('mean')
-            .to_dict()
-           )
\ No newline at end of file
+def create_historical_props(site: str = 'draftkings', mode: str = 'classic', value: str = 'fpts') -> dict[str,float]:
+    """
+    Mean projection per player over every archived slate, read straight off the archive index
+    - Old data/historical/*.csv files are imported into the archive the first time
+    - value: fpts | e_fpts | fpts_last_n
+    """
+    archive = HistoricalArchive(site=site, mode=mode)
+    if not archive.dates():
+        archive.import_csvs(glob.glob(os.path.join(DATA_DIR, 'historical', '*.csv')))
+
+    return archive.means(value)
\ No newline at end of file
@@ -0,0 +1,140 @@
+"""
+Timing + exactness check for lineups.LineupGenerator on synthetic slates
+- Small slate brute forced over every combination of players, top lineups have to match the search exactly
+- Larger slates timed unconstrained (top n) and with exposure/uniqueness caps
+- Exits non-zero if the search misses a lineup or breaks a roster/exposure/uniqueness rule
+
+Usage (from src/):
+    python -m benchmarks.bench_lineups --players 120 250 --lineups 150 --workers 1
+"""
+import sys
+import time
+import argparse
+import itertools
+import numpy as np
+import pandas as pd
+
+from lineups import LineupGenerator, ROSTERS, _slot_accepts
+from _utils import _output_msgs
+
+POSITIONS = ['PG', 'SG', 'SF', 'PF', 'C', 'PG/SG', 'SG/SF', 'SF/PF', 'PF/C']
+
+
+def make_slate(n_players: int, n_games: int = 6, seed: int = 0) -> pd.DataFrame:
+    """load_slate-shaped frame (indexed by name): pos, team, opp, salary, fpts"""
+    rng = np.random.default_rng(seed)
+    teams = [f'T{idx:02d}' for idx in range(2 * n_games)]
+    team = rng.choice(teams, n_players)
+    salary = 100 * rng.integers(30, 110, n_players)
+
+    return pd.DataFrame({
+        'name': [f'Player {idx}' for idx in range(n_players)],
+        'pos': rng.choice(POSITIONS, n_players),
+        'team': team,
+        'opp': [teams[teams.index(team_) ^ 1] for team_ in team],
+        'salary': salary,
+        'fpts': np.round(salary / 1_000 * rng.normal(5.0, 1.0, n_players), 2),
+    }).set_index('name')
+
+
+def brute_force(generator: LineupGenerator, n_lineups: int) -> list[float,...]:
+    """Scores of the n best valid lineups, every combination of entries checked"""
+    entries, roster = generator.entries, generator.roster
+    size = len(roster.slots)
+    options = [
+        [slot for slot, name_ in enumerate(roster.slots) if _slot_accepts(name_, frozenset(pos.split('/')), captain)]
+        for pos, captain in zip(entries.pos, entries.captain)
+    ]
+
+    cost, points, name, team, game = (entries[col].tolist() for col in ('cost', 'points', 'name', 'team', 'game'))
+    scores = []
+    for picked in itertools.combinations(range(len(entries)), size):
+        teams = [team[idx] for idx in picked]
+        if sum(cost[idx] for idx in picked) > roster.salary_cap or len({name[idx] for idx in picked}) < size:
+            continue
+        if len(set(teams)) < roster.min_teams or len({game[idx] for idx in picked}) < roster.min_games:
+            continue
+        if roster.max_per_team and max(teams.count(team_) for team_ in teams) > roster.max_per_team:
+            continue
+        if not any(len(set(slots)) == size for slots in itertools.product(*(options[idx] for idx in picked))):
+            continue
+        scores.append(sum(points[idx] for idx in picked))
+
+    return sorted(scores, reverse=True)[:n_lineups]
+
+
+def check(lineups: pd.DataFrame, generator: LineupGenerator, n_lineups: int) -> list[str,...]:
+    msgs = []
+    names = lineups.drop(lineups.columns[-2:], axis=1)
+    if (lineups.salary > generator.roster.salary_cap).any():
+        msgs.append('lineup over the salary cap')
+    if (names == '').any().any():
+        msgs.append('lineup with an empty slot')
+
+    cap = max(1, int(generator.max_exposure * n_lineups))
+    if (LineupGenerator.exposure(lineups) * len(lineups)).round().max() > cap:
+        msgs.append(f'player in more than {cap} lineups')
+
+    sets = [set(row) for row in names.itertuples(index=False)]
+    overlap = max((len(a & b) for a, b in itertools.combinations(sets, 2)), default=0)
+    if overlap > names.shape[1] - generator.min_unique:
+        msgs.append(f'two lineups share {overlap} players')
+
+    return msgs
+
+
+def run(sizes: list[int,...], n_lineups: int, site: str, workers: int|None) -> tuple[list[dict[str,float],...], list[str,...]]:
+    mismatches = []
+
+    # Exactness: small enough to enumerate
+    generator = LineupGenerator(make_slate(16, n_games=3), site=site, workers=workers)
+    found = generator.generate(20)[generator.value].tolist()
+    expected = [round(score, 3) for score in brute_force(generator, 20)]
+    if found != expected:
+        mismatches.append(f'top 20 off brute force: {found[:5]}... vs {expected[:5]}...')
+
+    results = []
+    for n_players in sizes:
+        slate = make_slate(n_players)
+        for constraints in ({}, {'max_exposure': 0.5, 'min_unique': 2}):
+            generator = LineupGenerator(slate, site=site, workers=workers, **constraints)
+
+            start = time.perf_counter()
+            lineups = generator.generate(n_lineups)
+            elapsed = time.perf_counter() - start
+
+            label = ', '.join(f'{key}={value}' for key, value in constraints.items()) or 'unconstrained'
+            mismatches += [f'{n_players} players ({label}): {msg}' for msg in check(lineups, generator, n_lineups)]
+            results.append({
+                'players': n_players,
+                'constraints': label,
+                'lineups': len(lineups),
+                'seconds': elapsed,
+                'best': lineups[generator.value].max(),
+            })
+
+    return results, mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, nargs='+', default=[120, 250])
+    parser.add_argument('--lineups', type=int, default=150)
+    parser.add_argument('--site', choices=sorted({site for site, _ in ROSTERS}), default='draftkings')
+    parser.add_argument('--workers', type=int, default=None)
+    args = parser.parse_args()
+
+    results, mismatches = run(args.players, args.lineups, args.site, args.workers)
+    if mismatches:
+        _output_msgs(mismatches, warning=True)
+
+    _output_msgs([
+        ', '.join(f'{key}: {round(value, 2) if isinstance(value, float) else value}' for key, value in result.items())
+        for result in results
+    ])
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,163 @@
+"""
+Micro-benchmark for the edits / overrides / normalization / open-movement stage of PropHandler._post_scrape_processing
+- Synthetic slates of increasing size, no network or files involved
+- Times PropHandler._adjust_projections against the previous per-name loop implementation (kept here as reference)
+- Exits non-zero if the two disagree (e_open/e_movement compared only where the old code didn't produce NaN)
+
+Usage (from src/):
+    python -m benchmarks.bench_postprocess --sizes 300 3000 30000
+"""
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from prophandler import PropHandler
+from _utils import _output_msgs
+
+
+def make_slate(n_players: int, seed: int = 0) -> tuple[pd.DataFrame, dict[str,float], dict[str,float], pd.DataFrame]:
+    """Slate frame as _project_frame returns it, plus edits, overrides and tracker open values"""
+    rng = np.random.default_rng(seed)
+    names = [f'Player {idx}' for idx in range(n_players)]
+    has_props = rng.random(n_players) < 0.6
+    fpts = np.where(has_props, rng.uniform(10, 60, n_players).round(3), 0.0)
+
+    df = pd.DataFrame({
+        'pos': rng.choice(['PG', 'SG', 'SF', 'PF', 'C'], n_players),
+        'salary': rng.integers(30, 125, n_players) * 100,
+        'team': rng.choice(['DEN', 'BKN', 'MIL', 'WAS'], n_players),
+        'opp': rng.choice(['DEN', 'BKN', 'MIL', 'WAS'], n_players),
+        'gametime': [(7, 0)] * n_players,
+        'fpts': fpts,
+        'e_fpts': (fpts * rng.uniform(0.45, 0.55, n_players)),
+        'props': np.where(has_props, 'PRA3(BST)', '---'),
+    }, index=pd.Index(names, name='name'))
+
+    edited = rng.choice(names, max(1, n_players // 20), replace=False)
+    edits = {name: round(float(rng.uniform(5, 40)), 1) for name in edited}
+    overridden = rng.choice(names, max(1, n_players // 50), replace=False)
+    override_edits = {name: round(float(rng.uniform(5, 40)), 1) for name in overridden}
+
+    tracked = df.loc[df.fpts > 0.0].sample(frac=0.9, random_state=seed)
+    open_values = pd.DataFrame({
+        'props_open': tracked.fpts + rng.normal(0, 1, len(tracked)),
+        'e_props_open': tracked.e_fpts + rng.normal(0, 0.5, len(tracked)),
+    })
+
+    return df, edits, override_edits, open_values
+
+
+def legacy_adjust_projections(df, edits, override_edits, normalize_chalk, open_values) -> pd.DataFrame:
+    """Loop version that lived in _post_scrape_processing before, verbatim apart from the verbose prints"""
+    df = df.copy()
+    for name, edit in edits.items():
+        fpts = df.fpts.get(name, 0.0)
+        if not fpts:
+            df.loc[name, 'fpts'] = edit
+            df.loc[name, 'e_fpts'] = 0.5*edit
+            df.loc[name, 'props'] = '---'
+
+    for name, override_edit in override_edits.items():
+        df.loc[name, 'fpts'] = override_edit
+        df.loc[name, 'e_fpts'] = 0.5*override_edit
+
+    for col in ("fpts", "e_fpts"):
+        df[f"{col}/$"] = 1_000 * (df[col] / df.salary)
+
+    if normalize_chalk:
+        df.loc[(df.props == '---') & (df['fpts/$'] >= 4.7), 'fpts'] = ((df.salary / 1000) * 5.0).round(2)
+        df.loc[(df.props == '---') & (df['fpts/$'] >= 4.7), 'e_fpts'] = (df.loc[(df.props == '---') & (df['fpts/$'] >= 4.7)].fpts / 2).round(2)
+        for col in ("fpts", "e_fpts"): df[f"{col}/$"] = 1_000 * (df[col] / df.salary)
+
+    df = df.loc[df.fpts > 0.0].dropna().assign(salary=lambda df_: df_.salary.astype('int'))
+
+    open_props = open_values.props_open.round(3).to_dict()
+    open_e_props = open_values.e_props_open.round(3).to_dict()
+
+    df['open'] = df.index.map(lambda name: open_props.get(name, 0.0))
+    df['e_open'] = df.index.map(lambda name: open_e_props.get(name, 0.0))
+
+    df.loc[(df.open == 0.0) & (df.fpts > 0.0), 'open'] = df.loc[(df.open == 0.0) & (df.fpts > 0.0), 'fpts']
+    df.loc[(df.e_open == 0.0) & (df.e_fpts > 0.0), 'e_open'] = df.loc[(df.open == 0.0) & (df.e_fpts > 0.0), 'e_fpts']
+
+    df['movement'] = (df.fpts-df.open).round(3)
+    df['e_movement'] = (df.e_fpts-df.e_open).round(3)
+
+    return df
+
+
+def compare(old: pd.DataFrame, new: pd.DataFrame) -> list[str,...]:
+    mismatches = []
+    if list(old.index) != list(new.index):
+        mismatches.append(f'index differs: {len(old)} vs {len(new)} players')
+        return mismatches
+
+    for column in old.columns:
+        a, b = old[column], new[column]
+        if column in ('e_open', 'e_movement'):
+            # Old code assigned NaN to e_open (-> e_movement) for players without a tracker open value
+            a, b = a.loc[old.e_open.notna()], b.loc[old.e_open.notna()]
+        if a.dtype.kind in 'fi':
+            same = np.array_equal(a.to_numpy(dtype='float64'), b.to_numpy(dtype='float64'), equal_nan=True)
+        else:
+            same = a.equals(b)
+        if not same:
+            mismatches.append(f'{column} differs')
+
+    return mismatches
+
+
+def _best_of(func, repeat: int) -> float:
+    timings = []
+    for _ in range(repeat):
+        start = time.perf_counter()
+        func()
+        timings.append(time.perf_counter() - start)
+    return min(timings)
+
+
+def run(sizes: list[int,...], repeat: int = 5, normalize_chalk: bool = True) -> tuple[list[dict[str,float],...], list[str,...]]:
+    results, mismatches = [], []
+    for n_players in sizes:
+        df, edits, override_edits, open_values = make_slate(n_players)
+        args = (df, edits, override_edits, normalize_chalk, open_values)
+
+        mismatches += [
+            f'{n_players} players: {msg}'
+            for msg in compare(legacy_adjust_projections(*args), PropHandler._adjust_projections(*args))
+        ]
+
+        legacy_s = _best_of(lambda: legacy_adjust_projections(*args), repeat)
+        vectorized_s = _best_of(lambda: PropHandler._adjust_projections(*args), repeat)
+        results.append({
+            'players': n_players,
+            'legacy_ms': 1_000 * legacy_s,
+            'vectorized_ms': 1_000 * vectorized_s,
+            'speedup': legacy_s / vectorized_s if vectorized_s else 0.0,
+        })
+
+    return results, mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--sizes', type=int, nargs='+', default=[300, 3_000, 30_000])
+    parser.add_argument('--repeat', type=int, default=5)
+    args = parser.parse_args()
+
+    results, mismatches = run(args.sizes, args.repeat)
+    if mismatches:
+        _output_msgs(mismatches, warning=True)
+
+    _output_msgs([
+        ', '.join(f'{key}: {round(value, 2) if isinstance(value, float) else value}' for key, value in result.items())
+        for result in results
+    ])
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
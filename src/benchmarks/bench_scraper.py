@@ -0,0 +1,296 @@
+"""
+Offline benchmark + regression check for PropScraper
+- Serves saved pages from data/fixtures/scoresandodds instead of hitting scoresandodds
+- Either through a file-backed requests transport (default) or a local stand-in HTTP server (--server)
+- Fixture players index lists the names on data/current-*.csv, so a full PropHandler run works offline too
+- Reports pages/sec, p50/p99 parse latency, batch projection time and peak memory for directory + full slate scrape
+- Same path PropHandler runs: scrape_slate_raw -> projections.project_players
+- Exits non-zero if any fixture no longer projects to its value in expected.json (every installed parser backend checked)
+
+Usage (from src/):
+    python -m benchmarks.bench_scraper --players 280 --workers 8
+"""
+import os
+import sys
+import glob
+import html
+import json
+import time
+import zlib
+import argparse
+import threading
+import tracemalloc
+import http.server
+from urllib.parse import urlparse
+
+import requests
+import pandas as pd
+from requests.adapters import BaseAdapter
+
+from designs import DATA_DIR
+from propscraper import PropScraper
+from propscraper.session import ScraperSession
+import propscraper.parser
+from propscraper.parser import PARSER_BACKENDS
+from propscraper.conversions import INITIALS_TEAM_MAP
+from prophandler.contestfile import ContestFile
+from projections import project_prop_rows, project_players
+from _utils import _output_msgs
+
+FIXTURES_DIR = os.path.join(DATA_DIR, 'fixtures', 'scoresandodds')
+DIRECTORY_URL = "https://www.scoresandodds.com/nba/players"
+
+# Date the fixtures were saved for, scraper is pinned to it so results don't depend on today
+FIXTURES_DATE_STR = '01/17'
+
+PLAYER_FIXTURES = [
+    'player-current.html',
+    'player-fallback.html',
+    'player-past-date.html',
+    'player-no-props.html',
+    'player-double-double.html',
+]
+
+
+def _load_fixtures() -> dict[str, bytes]:
+    fixtures = {}
+    for file in ['players.html'] + PLAYER_FIXTURES:
+        with open(os.path.join(FIXTURES_DIR, file), 'rb') as f:
+            fixtures[file] = f.read()
+    return fixtures
+
+
+def build_directory_fixture(contest_files: list[str,...]|None = None) -> bytes:
+    """
+    players.html listing everyone on the bundled contest files (data/current-*.csv) under their team
+    - Names match the slates, so PropHandler.load/constant_scrape run end to end offline against the fixtures
+    - Rebuild after swapping contest files: python -m benchmarks.bench_scraper --rebuild-directory
+    """
+    contest_files = contest_files or sorted(glob.glob(os.path.join(DATA_DIR, 'current-*.csv')))
+    players = (
+        pd.concat([ContestFile(path).frame()[['name', 'team']] for path in contest_files], ignore_index=True)
+        .drop_duplicates('name')
+        .sort_values(['team', 'name'])
+    )
+
+    modules = []
+    for team, names in players.groupby('team').name:
+        links = '\n'.join(
+            f'          <li><a href="/nba/players/{"-".join(name.lower().replace(chr(39), "").split())}-{team.lower()}">{html.escape(name)}</a></li>'
+            for name in names
+        )
+        modules.append(
+            '    <div class="module">\n'
+            f'      <div class="module-header"><h3>{INITIALS_TEAM_MAP[team]}</h3></div>\n'
+            '      <div class="module-body">\n'
+            f'        <ul>\n{links}\n        </ul>\n'
+            '      </div>\n'
+            '    </div>'
+        )
+
+    return (
+        '<!DOCTYPE html>\n<html lang="en">\n'
+        '<head><meta charset="utf-8"><title>NBA Players | Scores and Odds</title></head>\n'
+        '<body>\n  <main>\n' + '\n'.join(modules) + '\n  </main>\n</body>\n</html>\n'
+    ).encode()
+
+
+# Paths pinned to one fixture (check_expected), anything else is mapped by hash
+FIXTURE_URLS = {}
+
+
+def _fixture_for_path(path: str) -> str:
+    """Directory page for the index, every player URL deterministically mapped onto one of the player fixtures"""
+    if path.rstrip('/') == '/nba/players':
+        return 'players.html'
+    if path in FIXTURE_URLS:
+        return FIXTURE_URLS[path]
+    return PLAYER_FIXTURES[zlib.crc32(path.encode()) % len(PLAYER_FIXTURES)]
+
+
+class FixtureAdapter(BaseAdapter):
+    """requests transport answering every GET from the fixture files, no sockets involved"""
+
+    def __init__(self, fixtures: dict[str, bytes]):
+        super().__init__()
+        self.fixtures = fixtures
+
+    def send(self, request, **kwargs) -> requests.Response:
+        response = requests.Response()
+        response.status_code = 200
+        response._content = self.fixtures[_fixture_for_path(urlparse(request.url).path)]
+        response.headers['Content-Type'] = 'text/html; charset=utf-8'
+        response.url = request.url
+        response.request = request
+        return response
+
+    def close(self) -> None:
+        return
+
+
+def serve_fixtures(fixtures: dict[str, bytes]) -> http.server.ThreadingHTTPServer:
+    """Local stand-in for scoresandodds on a random port, exercises real sockets + keep-alive"""
+
+    class FixtureHandler(http.server.BaseHTTPRequestHandler):
+        protocol_version = 'HTTP/1.1'
+
+        def do_GET(self):
+            body = fixtures[_fixture_for_path(urlparse(self.path).path)]
+            self.send_response(200)
+            self.send_header('Content-Type', 'text/html; charset=utf-8')
+            self.send_header('Content-Length', str(len(body)))
+            self.end_headers()
+            self.wfile.write(body)
+
+        def log_message(self, *args):
+            return
+
+    server = http.server.ThreadingHTTPServer(('127.0.0.1', 0), FixtureHandler)
+    threading.Thread(target=server.serve_forever, daemon=True).start()
+    return server
+
+
+def _percentile(values: list[float,...], q: float) -> float:
+    values = sorted(values)
+    return values[min(len(values) - 1, int(q * len(values)))] if values else 0.0
+
+
+def check_expected(fixtures: dict[str, bytes], backends: tuple[str,...] = PARSER_BACKENDS) -> list[str,...]:
+    """
+    Project every player fixture with each parser backend and compare against expected.json, returns list of mismatches
+    - Scraper and the past (*) marker both pinned to FIXTURES_DATE_STR, results don't depend on today
+    """
+    with open(os.path.join(FIXTURES_DIR, 'expected.json')) as f:
+        expected = json.load(f)
+
+    # Same path PropHandler runs: scrape_slate_raw -> project_prop_rows -> project_players
+    players = [(file, f'https://www.scoresandodds.com/fixtures/{file}', 'DEN') for file in PLAYER_FIXTURES]
+    for file, url, _ in players:
+        FIXTURE_URLS[urlparse(url).path] = file
+
+    mismatches = []
+    default_backend = propscraper.parser.PARSER_BACKEND
+    try:
+        for backend in backends:
+            propscraper.parser.PARSER_BACKEND = backend
+            session = ScraperSession()
+            session.session.mount('https://', FixtureAdapter(fixtures))
+            scraper = PropScraper(scoresandodds_date_str=FIXTURES_DATE_STR, use_cache=False, session=session, host_delay=0.0)
+            projected = project_players(project_prop_rows(scraper.scrape_slate_raw(players), current_date_str=FIXTURES_DATE_STR))
+
+            for file in PLAYER_FIXTURES:
+                fpts, e_fpts, shorthand = tuple(projected.loc[file]) if file in projected.index else (0.0, 0.0, '---')
+                want = expected[file]
+                if any([
+                    round(fpts, 6) != round(want['fpts'], 6),
+                    round(e_fpts, 6) != round(want['e_fpts'], 6),
+                    shorthand != want['props'],
+                ]):
+                    mismatches.append(f'{file} ({backend}): got {(fpts, e_fpts, shorthand)}, expected {want}')
+    finally:
+        propscraper.parser.PARSER_BACKEND = default_backend
+
+    return mismatches
+
+
+def run(n_players: int = 280, workers: int = 8, server: bool = False, backend: str|None = None) -> dict[str, float]:
+
+    fixtures = _load_fixtures()
+    if backend:
+        propscraper.parser.PARSER_BACKEND = backend
+
+    directory_url = DIRECTORY_URL
+    session = ScraperSession(pool_size=workers)
+    if server:
+        stand_in = serve_fixtures(fixtures)
+        directory_url = f'http://127.0.0.1:{stand_in.server_port}/nba/players'
+    else:
+        session.session.mount('https://', FixtureAdapter(fixtures))
+
+    scraper = PropScraper(
+        directory_url=directory_url,
+        scoresandodds_date_str=FIXTURES_DATE_STR,
+        max_in_flight=workers,
+        host_delay=0.0,
+        session=session,
+        use_cache=False,
+    )
+
+    # Time parsing of every page separately from fetching
+    parse_latencies = []
+    raw_player_props = scraper._raw_player_props
+    def timed_raw_player_props(*args):
+        start = time.perf_counter()
+        rows = raw_player_props(*args)
+        parse_latencies.append(time.perf_counter() - start)
+        return rows
+    scraper._raw_player_props = timed_raw_player_props
+
+    start = time.perf_counter()
+    directory = scraper.create_webpage_directory()
+    directory_time = time.perf_counter() - start
+
+    players = [(name, url, team) for team, urls in directory.items() for name, url in urls.items()]
+    players = (players * (n_players // len(players) + 1))[:n_players]
+    # Unique URLs (and names, so every page projects to its own player) -> nothing served from the in-memory parse cache
+    players = [(f'{name} {idx}', f'{url}?n={idx}', team) for idx, (name, url, team) in enumerate(players)]
+
+    start = time.perf_counter()
+    raw = scraper.scrape_slate_raw(players)
+    slate_time = time.perf_counter() - start
+    latencies, parse_latencies = parse_latencies[:], []
+
+    start = time.perf_counter()
+    projected = project_players(project_prop_rows(raw, scraper.site, FIXTURES_DATE_STR), scraper.site)
+    projection_time = time.perf_counter() - start
+
+    # Separate pass for memory since tracemalloc itself skews timings
+    scraper._raw_parsed = {}
+    tracemalloc.start()
+    project_players(project_prop_rows(scraper.scrape_slate_raw(players), scraper.site, FIXTURES_DATE_STR), scraper.site)
+    _, peak_memory = tracemalloc.get_traced_memory()
+    tracemalloc.stop()
+
+    if server:
+        stand_in.shutdown()
+
+    return {
+        'backend': propscraper.parser.PARSER_BACKEND,
+        'transport': 'server' if server else 'file',
+        'players': len(players),
+        'scraped': len(projected),
+        'directory_s': directory_time,
+        'slate_s': slate_time,
+        'projection_s': projection_time,
+        'pages_per_s': len(players) / slate_time if slate_time else 0.0,
+        'parse_p50_ms': 1_000 * _percentile(latencies, 0.50),
+        'parse_p99_ms': 1_000 * _percentile(latencies, 0.99),
+        'peak_memory_mb': peak_memory / 1_000_000,
+    }
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, default=280)
+    parser.add_argument('--workers', type=int, default=8)
+    parser.add_argument('--server', action='store_true', help='Serve fixtures over local HTTP instead of file transport')
+    parser.add_argument('--backend', choices=PARSER_BACKENDS, default=None)
+    parser.add_argument('--rebuild-directory', action='store_true', help='Regenerate players.html from data/current-*.csv first')
+    args = parser.parse_args()
+
+    if args.rebuild_directory:
+        with open(os.path.join(FIXTURES_DIR, 'players.html'), 'wb') as f:
+            f.write(build_directory_fixture())
+
+    mismatches = check_expected(_load_fixtures())
+    if mismatches:
+        _output_msgs(mismatches, warning=True)
+
+    results = run(args.players, args.workers, args.server, args.backend)
+    _output_msgs([f'{key}: {round(value, 3) if isinstance(value, float) else value}' for key, value in results.items()])
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
@@ -0,0 +1,115 @@
+"""
+Timing + sanity check for simulation.simulate_players on synthetic slates
+- Props generated from known Poisson means (de-vigged over odds computed exactly), no network or files involved
+- Checks the fit recovers the means, sampled mean matches the analytic mean, sampled DD rate matches the exact dd_prob
+- Exits non-zero if any check is off by more than its tolerance
+
+Usage (from src/):
+    python -m benchmarks.bench_simulation --players 300 1000 --samples 10000
+"""
+import sys
+import time
+import argparse
+import numpy as np
+import pandas as pd
+
+from designs import SCORING, BONUS
+from simulation import simulate_players, fit_poisson_means, _poisson_at_least
+from _utils import _output_msgs
+
+# Typical Poisson means per stat for a rotation player: low, high
+STAT_MEANS = {
+    'points': (6.0, 32.0),
+    'rebounds': (2.0, 13.0),
+    'assists': (1.0, 10.0),
+    '3 pointers': (0.5, 4.5),
+    'steals': (0.3, 2.0),
+    'blocks': (0.2, 2.5),
+    'turnovers': (0.5, 4.0),
+}
+
+
+def make_props(n_players: int, seed: int = 0) -> tuple[pd.DataFrame, np.ndarray]:
+    """project_prop_rows-shaped table (name, stat, line, true_odds_over) + the means it was built from (players x STAT_MEANS)"""
+    rng = np.random.default_rng(seed)
+    means = np.column_stack([rng.uniform(low, high, n_players) for low, high in STAT_MEANS.values()])
+    lines = np.floor(means) + 0.5
+
+    props = pd.DataFrame({
+        'name': np.repeat([f'Player {idx}' for idx in range(n_players)], len(STAT_MEANS)),
+        'stat': np.tile(list(STAT_MEANS), n_players),
+        'line': lines.ravel(),
+        'true_odds_over': _poisson_at_least(np.floor(lines.ravel()) + 1, means.ravel()),
+    })
+
+    return props, means
+
+
+def check(props: pd.DataFrame, means: np.ndarray, sim: pd.DataFrame, site: str, n_samples: int) -> list[str,...]:
+    msgs = []
+    fitted = fit_poisson_means(props.line.to_numpy(), props.true_odds_over.to_numpy())
+    fit_error = np.abs(fitted - means.ravel()).max()
+    if fit_error > 1e-6:
+        msgs.append(f'Poisson fit off by {fit_error:.2e}')
+
+    scoring = np.array([SCORING[site][stat_] for stat_ in STAT_MEANS])
+    analytic = means @ scoring + sim.e_bonus.to_numpy()
+    mean_error = np.abs(sim.sim_mean.to_numpy() - analytic).max()
+    # Sampling error of the mean ~ std / sqrt(samples)
+    if mean_error > 6 * sim.sim_std.max() / np.sqrt(n_samples):
+        msgs.append(f'sampled mean off analytic by {mean_error:.3f}')
+
+    return msgs
+
+
+def run(sizes: list[int,...], n_samples: int, site: str) -> tuple[list[dict[str,float],...], list[str,...]]:
+    results, mismatches = [], []
+    for n_players in sizes:
+        props, means = make_props(n_players)
+
+        start = time.perf_counter()
+        sim = simulate_players(props, site, n_samples=n_samples, seed=0)
+        elapsed = time.perf_counter() - start
+
+        mismatches += [f'{n_players} players: {msg}' for msg in check(props, means, sim, site, n_samples)]
+
+        # Sampled DD rate vs exact for a handful of players, from points/rebounds/assists
+        # (steals/blocks means top out at 2.5 -> P(10+) is negligible)
+        rng = np.random.default_rng(1)
+        draws = rng.poisson(means[:10, :3, None], size=(10, 3, n_samples)) >= 10
+        sampled_dd = (draws.sum(axis=1) >= 2).mean(axis=1)
+        dd_error = np.abs(sampled_dd - sim.dd_prob.to_numpy()[:10]).max()
+        if dd_error > 0.03:
+            mismatches.append(f'{n_players} players: sampled DD rate off exact by {dd_error:.3f}')
+
+        results.append({
+            'players': n_players,
+            'samples': n_samples,
+            'seconds': elapsed,
+            'draws_per_s': n_players * len(STAT_MEANS) * n_samples / elapsed,
+        })
+
+    return results, mismatches
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    parser.add_argument('--players', type=int, nargs='+', default=[300, 1_000])
+    parser.add_argument('--samples', type=int, default=10_000)
+    parser.add_argument('--site', choices=list(BONUS), default='draftkings')
+    args = parser.parse_args()
+
+    results, mismatches = run(args.players, args.samples, args.site)
+    if mismatches:
+        _output_msgs(mismatches, warning=True)
+
+    _output_msgs([
+        ', '.join(f'{key}: {round(value, 2) if isinstance(value, float) else value}' for key, value in result.items())
+        for result in results
+    ])
+
+    return 1 if mismatches else 0
+
+
+if __name__ == '__main__':
+    sys.exit(main())
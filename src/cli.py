@@ -0,0 +1,219 @@
+"""
+Command line entry point, no Jupyter needed
+
+Usage (from src/):
+    python -m cli scrape --site draftkings
+    python -m cli watch --max-runs 100 --requests-per-minute 60
+    python -m cli load-slate --sort fpts/$
+    python -m cli tracker --player "Nikola Jokic" --plot jokic.png
+    python -m cli serve --port 8765
+    python -m cli simulate --samples 10000 --sort p90
+    python -m cli lineups --n 150 --max-exposure 0.5 --min-unique 2 --out lineups.csv
+
+- Heavy modules (pandas, scrapers, handler) only imported once a command runs, plotting only for tracker --plot
+- load-slate / simulate / lineups use an offline PropHandler: files only read, no network, nothing created
+- Time spent importing is reported on stderr so startup regressions are easy to spot
+"""
+import sys
+import time
+import argparse
+
+
+def _imports(command: str) -> dict:
+    """Modules a command needs, imported on demand"""
+    from prophandler import PropHandler, PropTracker, ProjectionService, InjuryFeed
+    from _utils import _display, _output_msgs
+
+    modules = {
+        'PropHandler': PropHandler,
+        'PropTracker': PropTracker,
+        'ProjectionService': ProjectionService,
+        'InjuryFeed': InjuryFeed,
+        '_display': _display,
+        '_output_msgs': _output_msgs,
+    }
+
+    if command == 'tracker-plot':
+        import matplotlib
+        matplotlib.use('Agg')
+        import matplotlib.pyplot as plt
+        modules['plt'] = plt
+
+    return modules
+
+
+def _handler_kwargs(args: argparse.Namespace, modules: dict) -> dict:
+    kwargs = {'site': args.site, 'mode': args.mode, 'verbose': args.verbose, 'drop': list(args.drop)}
+    if args.input_file:
+        kwargs['input_file'] = args.input_file
+    if args.output_file:
+        kwargs['output_file'] = args.output_file
+    if args.injury_file:
+        kwargs['injury_file'] = args.injury_file
+    if args.no_injuries:
+        # Feed still read, no status drops anyone
+        kwargs['injuries'] = modules['InjuryFeed'](path=args.injury_file, statuses=())
+    return kwargs
+
+
+def scrape(args: argparse.Namespace, modules: dict) -> int:
+    df = modules['PropHandler'](**_handler_kwargs(args, modules)).load(sort=args.sort)
+    modules['_display'](df.head(args.head))
+    return 0
+
+
+def watch(args: argparse.Namespace, modules: dict) -> int:
+    modules['PropHandler'](constant=True, **_handler_kwargs(args, modules)).constant_scrape(
+        max_runs=args.max_runs,
+        requests_per_minute=args.requests_per_minute,
+    )
+    return 0
+
+
+def serve(args: argparse.Namespace, modules: dict) -> int:
+    modules['ProjectionService'](
+        handler=modules['PropHandler'](constant=True, **_handler_kwargs(args, modules)),
+        host=args.host,
+        port=args.port,
+        max_runs=args.max_runs,
+        scrape_kwargs={'requests_per_minute': args.requests_per_minute},
+    ).serve_forever()
+    return 0
+
+
+def simulate(args: argparse.Namespace, modules: dict) -> int:
+    df = modules['PropHandler'](offline=True, **_handler_kwargs(args, modules)).simulate(n_samples=args.samples, seed=args.seed)
+    if df.empty:
+        modules['_output_msgs'](['No raw props for today yet, run scrape first.'], warning=True)
+        return 1
+    modules['_display'](df.sort_values(args.sort, ascending=False).head(args.head))
+    return 0
+
+
+def lineups(args: argparse.Namespace, modules: dict) -> int:
+    df = modules['PropHandler'](offline=True, **_handler_kwargs(args, modules)).lineups(
+        n_lineups=args.n,
+        value=args.value,
+        max_exposure=args.max_exposure,
+        min_unique=args.min_unique,
+        workers=args.workers,
+    )
+    if df.empty:
+        modules['_output_msgs'](['No lineups fit the salary cap, check the slate.'], warning=True)
+        return 1
+    if args.out:
+        df.to_csv(args.out, index=False)
+        modules['_output_msgs']([f'Saved {len(df)} lineups to {args.out}'])
+    modules['_display'](df.head(args.head))
+    return 0
+
+
+def load_slate(args: argparse.Namespace, modules: dict) -> int:
+    df = modules['PropHandler'](offline=True, **_handler_kwargs(args, modules)).load(update=False, sort=args.sort)
+    modules['_display'](df.head(args.head))
+    return 0
+
+
+def tracker(args: argparse.Namespace, modules: dict) -> int:
+    kwargs = {'date_str': args.date} if args.date else {}
+    tracker_ = modules['PropTracker'](**kwargs)
+    if not tracker_:
+        modules['_output_msgs'](['No tracker data for this date.'], warning=True)
+        return 1
+
+    if args.plot:
+        if not args.player:
+            modules['_output_msgs'](['--plot needs --player'], warning=True)
+            return 2
+        tracker_.visualize(args.player, value=args.value)
+        modules['plt'].savefig(args.plot, bbox_inches='tight')
+        modules['_output_msgs']([f'Saved {args.plot}'])
+        return 0
+
+    df = tracker_.movement()
+    if args.player:
+        df = df.loc[df.index == args.player]
+    modules['_display'](df.head(args.head))
+    return 0
+
+
+def build_parser() -> argparse.ArgumentParser:
+    parser = argparse.ArgumentParser(prog='python -m cli', description=__doc__, formatter_class=argparse.RawDescriptionHelpFormatter)
+    commands = parser.add_subparsers(dest='command', required=True)
+
+    handler_options = argparse.ArgumentParser(add_help=False)
+    handler_options.add_argument('--site', choices=['draftkings', 'fanduel'], default='draftkings')
+    handler_options.add_argument('--mode', choices=['classic', 'showdown'], default='classic')
+    handler_options.add_argument('--input-file', default=None, help='Contest file, default data/current-{site}.csv')
+    handler_options.add_argument('--output-file', default=None)
+    handler_options.add_argument('--drop', action='append', default=[], help='Player to leave out, repeatable')
+    handler_options.add_argument('--injury-file', default=None, help='FanDuel contest file with injury statuses, re-read when it changes, default data/current-fanduel.csv')
+    handler_options.add_argument('--no-injuries', action='store_true', help='Do not drop Out/Doubtful players')
+    handler_options.add_argument('--verbose', action='store_true')
+
+    table_options = argparse.ArgumentParser(add_help=False)
+    table_options.add_argument('--sort', default='e_fpts/$')
+    table_options.add_argument('--head', type=int, default=25)
+
+    commands.add_parser('scrape', parents=[handler_options, table_options], help='Scrape slate once and write projections')
+
+    watch_ = commands.add_parser('watch', parents=[handler_options], help='Keep scraping (PropHandler.constant_scrape)')
+    watch_.add_argument('--max-runs', type=int, default=100)
+    watch_.add_argument('--requests-per-minute', type=float, default=60)
+
+    serve_ = commands.add_parser('serve', parents=[handler_options], help='Keep scraping and serve slate/tracker as JSON over local HTTP')
+    serve_.add_argument('--host', default='127.0.0.1')
+    serve_.add_argument('--port', type=int, default=8765)
+    serve_.add_argument('--max-runs', type=int, default=10_000)
+    serve_.add_argument('--requests-per-minute', type=float, default=60)
+
+    simulate_ = commands.add_parser('simulate', parents=[handler_options], help='Fpts distributions + DD/TD odds from the last scrape, no fetching')
+    simulate_.add_argument('--samples', type=int, default=10_000)
+    simulate_.add_argument('--seed', type=int, default=None)
+    simulate_.add_argument('--sort', default='sim_mean')
+    simulate_.add_argument('--head', type=int, default=25)
+
+    lineups_ = commands.add_parser('lineups', parents=[handler_options], help='Top salary-cap lineups from the last projections, no fetching')
+    lineups_.add_argument('--n', type=int, default=150)
+    lineups_.add_argument('--value', default='fpts', help='Column to maximize, e.g. fpts or e_fpts')
+    lineups_.add_argument('--max-exposure', type=float, default=1.0, help='Max share of lineups any one player is in')
+    lineups_.add_argument('--min-unique', type=int, default=1, help='Min players each lineup differs from every other by')
+    lineups_.add_argument('--workers', type=int, default=None, help='Search processes, default one per CPU')
+    lineups_.add_argument('--out', default=None, help='Save lineups to this CSV')
+    lineups_.add_argument('--head', type=int, default=25)
+
+    commands.add_parser('load-slate', parents=[handler_options, table_options], help='Reload last projections without scraping')
+
+    tracker_ = commands.add_parser('tracker', help='Line movement from PropTracker')
+    tracker_.add_argument('--date', default=None, help='YYYY-MM-DD, default today')
+    tracker_.add_argument('--player', default=None)
+    tracker_.add_argument('--plot', default=None, help='Save movement chart for --player to this path')
+    tracker_.add_argument('--value', choices=['props', 'e_props'], default='e_props')
+    tracker_.add_argument('--head', type=int, default=25)
+
+    return parser
+
+
+COMMANDS = {
+    'scrape': scrape,
+    'watch': watch,
+    'serve': serve,
+    'simulate': simulate,
+    'lineups': lineups,
+    'load-slate': load_slate,
+    'tracker': tracker,
+}
+
+
+def main(argv: list[str,...]|None = None) -> int:
+    args = build_parser().parse_args(argv)
+
+    start = time.perf_counter()
+    modules = _imports('tracker-plot' if args.command == 'tracker' and args.plot else args.command)
+    print(f'Imports: {time.perf_counter() - start:.2f}s', file=sys.stderr)
+
+    return COMMANDS[args.command](args, modules)
+
+
+if __name__ == '__main__':
+    sys.exit(main())
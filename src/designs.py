@@ -5,7 +5,6 @@ import datetime
 import pandas as pd
 from dataclasses import dataclass, field
 
-import settings.custom
 from _utils import _clean_name
 from _errors import IncorrectInstallError
 
@@ -31,6 +30,13 @@ SCORING = {
     }
 }
 
+# Points on top of SCORING for 10+ in two/three of DOUBLES_STATS, DK pays both on a triple-double
+BONUS = {
+    'draftkings': {'double_double': 1.5, 'triple_double': 3.0},
+    'fanduel': {'double_double': 0.0, 'triple_double': 0.0},
+}
+DOUBLES_STATS = ['points', 'rebounds', 'assists', 'blocks', 'steals']
+
 # Common order for prop listings: PRA3BST
 SHORTHAND_ORDER = list(SCORING['draftkings'].keys())
 
@@ -94,6 +100,8 @@ class Prop:
     value: float
     implied_odds_over: float
     implied_odds_under: float
+    odds_over: int = 0
+    odds_under: int = 0
     vig: float = 0.0
     true_odds_over: float = 0.0
     true_odds_under: float = 0.0
@@ -101,6 +109,7 @@ class Prop:
     e_fpts: float = 0.0
     shorthand: str = ''
     past: bool = False
+    site: str = 'draftkings'
 
     @staticmethod
     def _calculate_vig(implied_odds_over: float, implied_odds_under: float) -> float:
@@ -109,7 +118,7 @@ class Prop:
     def __post_init__(self):
         
         object.__setattr__(self, 'name', _clean_name(self.name))
-        object.__setattr__(self, 'fpts', SCORING['draftkings'][self.stat.lower()]*self.value)
+        object.__setattr__(self, 'fpts', SCORING[self.site][self.stat.lower()]*self.value)
 
         object.__setattr__(self, 'vig', sum([self.implied_odds_over, self.implied_odds_under]) - 1.0)
 
@@ -132,6 +141,8 @@ class Prop:
             'value': self.value,
             'implied_odds_over': self.implied_odds_over,
             'implied_odds_under': self.implied_odds_under,
+            'odds_over': self.odds_over,
+            'odds_under': self.odds_under,
             'vig': self.vig,
             'true_odds_over': self.true_odds_over,
             'true_odds_under': self.true_odds_under,
@@ -186,33 +197,6 @@ class Player:
             
         return fpts, e_fpts, shorthand
 
-    @staticmethod
-    def _save_props(props: list[Prop,...]) -> None:
-        """
-        - Saves current INDIVIDUAL props in standardized format.
-        - Easy to transfer from .parquet to .csv, .parquet was 
-          used because of better performance when building the
-          minimal viable feature.
-        - Robust, complete and easy-to-use feature in development
-          currently since so many requests made for this tool
-          completely separate from fantasy.
-        - Current version usage (commented out) + additonal info at EOF.
-        """
-        master_props_file = os.path.join(DATA_DIR, 'playerprops', f'{CONTEST_DATE_STR}.parquet')
-
-        if not os.path.exists(master_props_file):
-            pd.concat(p.df for p in props).to_parquet(master_props_file)
-            return
-        
-        (pd
-         .concat([
-             pd.read_parquet(master_props_file),
-             pd.concat(p.df for p in props)
-         ])
-        ).to_parquet(master_props_file)
-
-        return
-        
     def __post_init__(self):
         
         if not self.props:
@@ -232,6 +216,4 @@ class Player:
             object.__setattr__(self, 'e_fpts', sum(prop.e_fpts for prop in self.props) + imputed_efpts)
             object.__setattr__(self, 'shorthand', ''.join(sorted([prop.shorthand for prop in self.props], key=lambda sh: 'PRASB3T'.index(sh))) + imputed_shorthand + past_props_marker)
 
-            # In progress, loads individual props but need to work on better data transfer
-            # Need to build multi-tiered tracker as well to track various line movements
-            # self._save_props(self.props)
+            # Individual props are filed in batches once per scrape cycle by prophandler.PropHistory
@@ -0,0 +1,363 @@
+import os
+import heapq
+import functools
+import numpy as np
+import pandas as pd
+import multiprocessing
+from concurrent.futures import ProcessPoolExecutor
+from dataclasses import dataclass, field
+
+# Slot -> positions it takes, 'CPT' only takes captain (MVP) entries, 'UTIL' takes every other entry
+SLOT_POSITIONS = {
+    'PG': {'PG'},
+    'SG': {'SG'},
+    'SF': {'SF'},
+    'PF': {'PF'},
+    'C': {'C'},
+    'G': {'PG', 'SG'},
+    'F': {'SF', 'PF'},
+}
+
+@dataclass(frozen=True)
+class Roster:
+    slots: tuple[str,...]
+    salary_cap: int
+    max_per_team: int|None = None
+    min_teams: int = 1
+    min_games: int = 1
+    captain: float = 0.0 # Points/salary multiplier for the CPT/MVP slot, 0 = no captain
+
+ROSTERS = {
+    ('draftkings', 'classic'): Roster(slots=('PG', 'SG', 'SF', 'PF', 'C', 'G', 'F', 'UTIL'), salary_cap=50_000, min_games=2),
+    ('fanduel', 'classic'): Roster(slots=('PG', 'PG', 'SG', 'SG', 'SF', 'SF', 'PF', 'PF', 'C'), salary_cap=60_000, max_per_team=4, min_teams=3),
+    ('draftkings', 'showdown'): Roster(slots=('CPT', 'UTIL', 'UTIL', 'UTIL', 'UTIL', 'UTIL'), salary_cap=50_000, min_teams=2, captain=1.5),
+    ('fanduel', 'showdown'): Roster(slots=('CPT', 'UTIL', 'UTIL', 'UTIL', 'UTIL'), salary_cap=60_000, max_per_team=4, min_teams=2, captain=1.5),
+}
+
+
+def _slot_accepts(slot: str, positions: frozenset[str], captain: bool) -> bool:
+    if slot == 'CPT':
+        return captain
+    if captain:
+        return False
+    return slot == 'UTIL' or bool(SLOT_POSITIONS[slot] & positions)
+
+
+@functools.lru_cache(maxsize=None)
+def _fits(type_masks: tuple[int,...], counts: tuple[int,...]) -> bool:
+    """Can entries of these types (count of each) go into distinct slots -> set of used-slot bitmasks, empty = no"""
+    used = {0}
+    for mask, count in zip(type_masks, counts):
+        for _ in range(count):
+            used = {state | bit for state in used for bit in _bits(mask) if not state & bit}
+            if not used:
+                return False
+    return True
+
+
+@functools.lru_cache(maxsize=None)
+def _bits(mask: int) -> tuple[int,...]:
+    return tuple(1 << idx for idx in range(mask.bit_length()) if mask >> idx & 1)
+
+
+# Search problem handed to every worker once (fork / initializer), never pickled per task
+_PROBLEM = None
+_SHARED_FLOOR = None
+
+
+def _init_worker(problem: dict, shared_floor) -> None:
+    global _PROBLEM, _SHARED_FLOOR
+    _PROBLEM, _SHARED_FLOOR = problem, shared_floor
+    return
+
+
+def _search(firsts: list[int,...], n_keep: int) -> list[tuple[float, tuple[int,...]],...]:
+    """
+    Branch and bound over entries sorted by points, best first: top n_keep lineups whose first (best) entry is in firsts
+    - Entries picked in index order, so every set of entries is visited once
+    - Bound on the rest of a lineup: best[idx, k, budget], the most points any k entries from idx on can score
+        within the salary left (knapsack over salary, positions ignored) -> never below the real best, and only
+        shrinks as idx grows, so once it can't beat the floor the whole tail is pruned
+    - Bounds read straight off the numpy table (item -> plain float), never copied into nested lists
+    - Positions/captain checked through _fits per type count, team cap as entries go in, min teams/games at the end
+    - Floor (n_keep-th best so far) shared across workers, any worker's floor is a valid bound for all
+    """
+    problem = _PROBLEM
+    pts, units, types, team, game, player = (problem[key] for key in ('pts', 'units', 'types', 'team', 'game', 'player'))
+    best, type_masks, size, budget_units = problem['best'], problem['type_masks'], problem['size'], problem['budget_units']
+    max_per_team, min_teams, min_games = problem['max_per_team'], problem['min_teams'], problem['min_games']
+    n_entries, n_types = len(pts), len(type_masks)
+    bound = best.item
+
+    heap = []
+    floor = [-np.inf]
+    picked = []
+    team_counts = [0] * problem['n_teams']
+    players_used = set()
+
+    def _keep(score: float) -> None:
+        entry = (score, tuple(picked))
+        if len(heap) < n_keep:
+            heapq.heappush(heap, entry)
+        elif score > heap[0][0]:
+            heapq.heapreplace(heap, entry)
+        if len(heap) == n_keep and heap[0][0] > floor[0]:
+            floor[0] = heap[0][0]
+            if _SHARED_FLOOR is not None and floor[0] > _SHARED_FLOOR.value:
+                _SHARED_FLOOR.value = floor[0]
+        return
+
+    def _extend(start: int, points: float, budget: int, counts: tuple[int,...]) -> None:
+        left = size - len(picked)
+        if not left:
+            if len({team[idx] for idx in picked}) >= min_teams and len({game[idx] for idx in picked}) >= min_games:
+                _keep(points)
+            return
+
+        for idx in range(start, n_entries - left + 1):
+            if points + bound(idx, left, budget) <= floor[0]:
+                return
+            rest = budget - units[idx]
+            if rest < 0 or points + pts[idx] + bound(idx + 1, left - 1, rest) <= floor[0]:
+                continue
+            if player[idx] in players_used:
+                continue
+            if max_per_team and team_counts[team[idx]] >= max_per_team:
+                continue
+            type_ = types[idx]
+            new_counts = counts[:type_] + (counts[type_] + 1,) + counts[type_ + 1:]
+            if not _fits(type_masks, new_counts):
+                continue
+
+            picked.append(idx)
+            players_used.add(player[idx])
+            team_counts[team[idx]] += 1
+            _extend(idx + 1, points + pts[idx], rest, new_counts)
+            team_counts[team[idx]] -= 1
+            players_used.discard(player[idx])
+            picked.pop()
+        return
+
+    empty = (0,) * n_types
+    for first in firsts:
+        if _SHARED_FLOOR is not None and _SHARED_FLOOR.value > floor[0]:
+            floor[0] = _SHARED_FLOOR.value
+        rest = budget_units - units[first]
+        if rest < 0 or pts[first] + bound(first + 1, size - 1, rest) <= floor[0]:
+            continue
+        type_ = types[first]
+        counts = empty[:type_] + (1,) + empty[type_ + 1:]
+        if not _fits(type_masks, counts):
+            continue
+
+        picked.append(first)
+        players_used.add(player[first])
+        team_counts[team[first]] += 1
+        _extend(first + 1, pts[first], rest, counts)
+        team_counts[team[first]] -= 1
+        players_used.discard(player[first])
+        picked.pop()
+
+    return heap
+
+
+@dataclass
+class LineupGenerator:
+    """
+    Top salary-cap lineups off a PropHandler slate (load_slate output, indexed by name)
+    - DK/FD classic and showdown roster rules (ROSTERS), showdown CPT/MVP at cpt_pts/cpt_sal (1.5x if missing)
+    - Exact: with min_unique=1 and no exposure caps, generate(n) returns the n best distinct lineups
+    - Exposure / uniqueness: lineups taken best first from a pool of the top pool_factor*n, skipping any that would
+        put a player over max_exposure or share more than size - min_unique entries with one already taken;
+        players who hit their cap are taken off the slate and the pool searched again until n are found
+    - Search split by best entry across a process pool, workers share the running cut-off
+    - value: column to maximize (fpts, e_fpts, or a simulation column merged onto the slate)
+    """
+    slate: pd.DataFrame
+    site: str = 'draftkings'
+    mode: str = 'classic'
+    value: str = 'fpts'
+    max_exposure: float|dict[str,float] = 1.0
+    min_unique: int = 1
+    exclude: list[str,...] = field(default_factory=list)
+    pool_factor: int = 5
+    workers: int|None = None
+
+    def __post_init__(self):
+        self.roster = ROSTERS[(self.site, self.mode)]
+        self.entries = self._entries()
+
+    def _entries(self) -> pd.DataFrame:
+        """One row per pickable entry (showdown: each player twice, as CPT and UTIL), best value first"""
+        slate = self.slate.loc[(self.slate[self.value] > 0.0) & ~self.slate.index.isin(self.exclude)]
+        entries = slate.assign(
+            points=slate[self.value].astype('float64'),
+            cost=slate.salary.astype('int'),
+            captain=False,
+            game=np.where(slate.team < slate.opp, slate.team + '@' + slate.opp, slate.opp + '@' + slate.team) if 'opp' in slate else slate.team,
+        )
+
+        if self.roster.captain:
+            multiplier = self.roster.captain
+            captains = entries.assign(
+                points=(slate['cpt_pts'] if self.value == 'fpts' and 'cpt_pts' in slate else multiplier * entries.points).astype('float64'),
+                cost=(slate['cpt_sal'] if 'cpt_sal' in slate else (multiplier * entries.cost).round()).astype('int'),
+                captain=True,
+            )
+            entries = pd.concat([captains, entries])
+
+        return (entries
+            .rename_axis('name')
+            .reset_index()
+            .sort_values(['points', 'cost'], ascending=[False, True], kind='stable')
+            .reset_index(drop=True)
+        )
+
+    def _problem(self, entries: pd.DataFrame) -> dict:
+        roster = self.roster
+        size = len(roster.slots)
+
+        positions = entries.pos.astype('str').str.split('/').map(frozenset)
+        type_keys = list(zip(positions, entries.captain))
+        distinct = list(dict.fromkeys(type_keys))
+        type_masks = tuple(
+            sum(1 << idx for idx, slot in enumerate(roster.slots) if _slot_accepts(slot, positions_, captain_))
+            for positions_, captain_ in distinct
+        )
+
+        pts = entries.points.to_numpy()
+        # Salaries in their common unit (100, 50 with captains) so the knapsack bound is a small table
+        unit = int(np.gcd.reduce(np.append(entries.cost.to_numpy(), roster.salary_cap)))
+        units = entries.cost.to_numpy() // unit
+        budget_units = roster.salary_cap // unit
+
+        # best[idx, k, budget]: most points from k entries at idx or later costing <= budget units, -inf if none fit
+        best = np.full((len(entries) + 2, size + 1, budget_units + 1), -np.inf)
+        best[:, 0, :] = 0.0
+        for idx in range(len(entries) - 1, -1, -1):
+            best[idx] = best[idx + 1]
+            if units[idx] <= budget_units:
+                best[idx, 1:, units[idx]:] = np.maximum(
+                    best[idx + 1, 1:, units[idx]:],
+                    pts[idx] + best[idx + 1, :-1, :budget_units + 1 - units[idx]],
+                )
+
+        teams = {team_: idx for idx, team_ in enumerate(entries.team.drop_duplicates())}
+        games = {game_: idx for idx, game_ in enumerate(entries.game.drop_duplicates())}
+        players = {name_: idx for idx, name_ in enumerate(entries.name.drop_duplicates())}
+
+        return {
+            'pts': pts.tolist(),
+            'units': units.tolist(),
+            'types': [distinct.index(key) for key in type_keys],
+            'team': entries.team.map(teams).tolist(),
+            'game': entries.game.map(games).tolist(),
+            'player': entries.name.map(players).tolist(),
+            'best': best,
+            'type_masks': type_masks,
+            'size': size,
+            'budget_units': budget_units,
+            'max_per_team': roster.max_per_team,
+            'min_teams': roster.min_teams,
+            'min_games': roster.min_games,
+            'n_teams': len(teams),
+        }
+
+    def _pool(self, n_keep: int, exclude: set[str]) -> list[tuple[float, tuple[int,...]],...]:
+        """Top n_keep lineups (score, indexes into self.entries) leaving out exclude, best first"""
+        entries = self.entries.loc[~self.entries.name.isin(exclude)]
+        problem = self._problem(entries)
+        n_firsts = len(entries) - problem['size'] + 1
+        if n_firsts <= 0:
+            return []
+
+        workers = max(1, min(self.workers or os.cpu_count() or 1, n_firsts))
+        if workers == 1:
+            _init_worker(problem, None)
+            found = _search(list(range(n_firsts)), n_keep)
+        else:
+            shared_floor = multiprocessing.Value('d', -np.inf, lock=False)
+            # Interleaved so every worker gets a share of the high value first picks
+            chunks = [list(range(worker, n_firsts, workers)) for worker in range(workers)]
+            with ProcessPoolExecutor(max_workers=workers, initializer=_init_worker, initargs=(problem, shared_floor)) as pool:
+                found = [lineup for lineups in pool.map(_search, chunks, [n_keep] * workers) for lineup in lineups]
+
+        labels = entries.index.to_numpy()
+        return [
+            (score, tuple(int(labels[idx]) for idx in picked))
+            for score, picked in sorted(found, key=lambda lineup: (-lineup[0], lineup[1]))[:n_keep]
+        ]
+
+    def _slots(self, picked: tuple[int,...]) -> list[str,...]:
+        """Entry indexes -> names in roster slot order"""
+        entries, slots = self.entries, self.roster.slots
+        options = [
+            [idx for idx, slot in enumerate(slots) if _slot_accepts(slot, frozenset(str(entries.pos[entry]).split('/')), entries.captain[entry])]
+            for entry in picked
+        ]
+
+        def _assign(position: int, used: tuple[int,...]) -> tuple[int,...]|None:
+            if position == len(picked):
+                return used
+            for slot in options[position]:
+                if slot not in used:
+                    found = _assign(position + 1, used + (slot,))
+                    if found:
+                        return found
+            return None
+
+        names = [''] * len(slots)
+        for entry, slot in zip(picked, _assign(0, ())):
+            names[slot] = entries.name[entry]
+        return names
+
+    def generate(self, n_lineups: int = 150) -> pd.DataFrame:
+        """n_lineups best lineups satisfying exposure/uniqueness (fewer if the slate runs out), one row each: slots, salary, value"""
+        size = len(self.roster.slots)
+        exposure = self.max_exposure if isinstance(self.max_exposure, dict) else {}
+        default_exposure = 1.0 if isinstance(self.max_exposure, dict) else self.max_exposure
+        constrained = self.min_unique > 1 or default_exposure < 1.0 or any(share < 1.0 for share in exposure.values())
+        cap = lambda name_: max(1, int(exposure.get(name_, default_exposure) * n_lineups))
+
+        chosen, counts, maxed = [], {}, set()
+        n_keep = n_lineups * (self.pool_factor if constrained else 1)
+        while len(chosen) < n_lineups:
+            pool = self._pool(n_keep, maxed)
+            added = 0
+            for score, picked in pool:
+                names = [self.entries.name[idx] for idx in picked]
+                if any(name_ in maxed for name_ in names):
+                    continue
+                if any(len(set(picked) & other) > size - self.min_unique for _, other in chosen):
+                    continue
+
+                chosen.append((score, set(picked)))
+                added += 1
+                for name_ in names:
+                    counts[name_] = counts.get(name_, 0) + 1
+                    if counts[name_] >= cap(name_):
+                        maxed.add(name_)
+                if len(chosen) == n_lineups:
+                    break
+
+            # Slate ran out of lineups, otherwise search again without capped players (deeper if nothing new fit)
+            if len(pool) < n_keep or (not added and n_keep >= 64 * n_lineups):
+                break
+            if not added:
+                n_keep *= 4
+
+        slots = self.roster.slots
+        slot_names = [f'{slot}{slots[:idx].count(slot) + 1}' if slots.count(slot) > 1 else slot for idx, slot in enumerate(slots)]
+        return pd.DataFrame(
+            [
+                self._slots(tuple(sorted(picked))) + [int(sum(self.entries.cost[idx] for idx in picked)), round(score, 3)]
+                for score, picked in chosen
+            ],
+            columns=slot_names + ['salary', self.value],
+        )
+
+    @staticmethod
+    def exposure(lineups: pd.DataFrame) -> pd.Series:
+        """Share of lineups each player is in"""
+        names = lineups.drop(lineups.columns[-2:], axis=1)
+        return (names.stack().value_counts() / len(lineups)).rename('exposure')
@@ -0,0 +1,176 @@
+import numpy as np
+import pandas as pd
+
+from designs import SCORING, IMPUTE_PROPS, SITE_CURRENT_DATE_STR
+
+# Order props appear in shorthand, same as Player
+SHORTHAND_SORT = 'PRASB3T'
+
+# Lines at/above this count towards double/triple-double bonus
+DOUBLES_LINE = 9.5
+DOUBLES_BONUS = {2: 1.5, 3: 4.5}
+
+RAW_COLUMNS = ['name', 'team', 'date', 'stat', 'line', 'over_odds', 'under_odds']
+
+
+def _parse_moneylines(odds: pd.Series) -> np.ndarray:
+    """Vectorized MoneyLine._parse_moneyline_str, passes through anything already numeric"""
+    if pd.api.types.is_numeric_dtype(odds):
+        return odds.to_numpy(dtype='int64')
+
+    odds = odds.astype('str').str.strip()
+    sign = np.where(odds.str[0] == '+', 1, -1)
+    return sign * odds.str[1:].astype('int64').to_numpy()
+
+
+def _implied_probability(moneyline: np.ndarray) -> np.ndarray:
+    """Vectorized MoneyLine.implied_probability"""
+    moneyline = moneyline.astype('float64')
+    # Both branches evaluated by np.where -> -100 gives 0 denominator on the unused side
+    with np.errstate(divide='ignore', invalid='ignore'):
+        return np.where(
+            moneyline < 0,
+            (-1*moneyline) / (-1*moneyline + 100),
+            100 / (moneyline + 100),
+        )
+
+
+def _grid(values: np.ndarray, cells: tuple[np.ndarray, np.ndarray], n_groups: int, width: int, fill: float) -> np.ndarray:
+    """One row per player, props laid out left to right in scrape order, padded with fill"""
+    grid = np.full((n_groups, width), fill)
+    grid[cells] = values
+    return grid
+
+
+def _grouped_sum(values: np.ndarray, cells: tuple[np.ndarray, np.ndarray], n_groups: int, width: int) -> np.ndarray:
+    """
+    - Per player sum matching builtin sum() bit for bit (Neumaier compensated summation as of Python 3.12)
+    - np.sum/groupby use pairwise/Kahan summation, which can differ from Player in the last digit
+    """
+    grid = _grid(values, cells, n_groups, width, 0.0)
+    total, compensation = np.zeros(n_groups), np.zeros(n_groups)
+    for col in range(width):
+        x = grid[:, col]
+        t = total + x
+        compensation += np.where(np.abs(total) >= np.abs(x), (total - t) + x, (x - t) + total)
+        total = t
+
+    return np.where((compensation != 0.0) & np.isfinite(compensation), total + compensation, total)
+
+
+def _grouped_product(values: np.ndarray, cells: tuple[np.ndarray, np.ndarray], n_groups: int, width: int) -> np.ndarray:
+    """Per player running product left to right, in the order props were scraped"""
+    grid = _grid(values, cells, n_groups, width, 1.0)
+    product = np.ones(n_groups)
+    for col in range(width):
+        product = product * grid[:, col]
+
+    return product
+
+
+def project_prop_rows(raw: pd.DataFrame, site: str = 'draftkings', current_date_str: str|None = None) -> pd.DataFrame:
+    """
+    Per prop columns for a whole slate at once, same values as Prop
+    - raw: long table with RAW_COLUMNS (odds as American ints or '+110'/'-120' strings)
+    - Adds implied/true odds, vig, fpts, e_fpts, shorthand, past
+    - past: prop not dated current_date_str (default SITE_CURRENT_DATE_STR, pinned by the fixture checks)
+    - Raw table is site independent, only fpts depends on site scoring
+    """
+    if raw.empty:
+        return raw.reindex(RAW_COLUMNS, axis=1)
+
+    odds_over = _parse_moneylines(raw.over_odds)
+    odds_under = _parse_moneylines(raw.under_odds)
+    implied_odds_over = _implied_probability(odds_over)
+    implied_odds_under = _implied_probability(odds_under)
+    total_implied_probability = implied_odds_over + implied_odds_under
+
+    stat = raw.stat.str.lower()
+    fpts = stat.map(SCORING[site]).to_numpy(dtype='float64') * raw.line.to_numpy(dtype='float64')
+    true_odds_over = implied_odds_over / total_implied_probability
+
+    return raw.assign(
+        stat=stat,
+        line=raw.line.astype('float64'),
+        over_odds=odds_over,
+        under_odds=odds_under,
+        implied_odds_over=implied_odds_over,
+        implied_odds_under=implied_odds_under,
+        vig=total_implied_probability - 1.0,
+        true_odds_over=true_odds_over,
+        true_odds_under=implied_odds_under / total_implied_probability,
+        fpts=fpts,
+        e_fpts=true_odds_over * fpts,
+        shorthand=stat.str[0].str.upper(),
+        past=raw.date != (current_date_str or SITE_CURRENT_DATE_STR),
+    )
+
+
+def project_players(props: pd.DataFrame, site: str = 'draftkings') -> pd.DataFrame:
+    """
+    Per player fpts, e_fpts, props (shorthand) from project_prop_rows output, checked against the saved fixtures in benchmarks.bench_scraper
+    - Props summed in row order, then IMPUTE_PROPS for missing stats, then double-double bonus
+    - Index: name, in order of first appearance
+    """
+    if props.empty:
+        return pd.DataFrame(
+            {'fpts': pd.Series(dtype='float64'), 'e_fpts': pd.Series(dtype='float64'), 'props': pd.Series(dtype='object')},
+            index=pd.Index([], name='name'),
+        )
+
+    scoring = SCORING[site]
+    names, group = np.unique(props.name.to_numpy(), return_inverse=True)
+    # Keep order players were scraped in
+    first_seen = np.argsort(np.unique(group, return_index=True)[1], kind='stable')
+    position = props.groupby(group, sort=False).cumcount().to_numpy()
+    width = int(position.max()) + 1
+    n_players = len(names)
+    cells = (group, position)
+
+    fpts = _grouped_sum(props.fpts.to_numpy(), cells, n_players, width)
+    e_fpts = _grouped_sum(props.e_fpts.to_numpy(), cells, n_players, width)
+
+    # Which stats each player has listed -> drives imputation + shorthand
+    stats = list(scoring)
+    stat_idx = props.stat.map({stat_: idx for idx, stat_ in enumerate(stats)}).to_numpy()
+    known = ~pd.isna(stat_idx)
+    listed = np.zeros((n_players, len(stats)), dtype=bool)
+    listed[group[known], stat_idx[known].astype('int')] = True
+
+    imputed_fpts, imputed_e_fpts = np.zeros(n_players), np.zeros(n_players)
+    shorthand = np.full(n_players, '', dtype=object)
+    imputed_shorthand = np.full(n_players, '', dtype=object)
+    for stat_ in sorted(stats, key=lambda stat_: SHORTHAND_SORT.index(stat_[0].upper())):
+        col = stats.index(stat_)
+        letter = stat_[0].upper()
+        shorthand = shorthand + np.where(listed[:, col], letter, '')
+
+        if stat_ in IMPUTE_PROPS:
+            missing = ~listed[:, col]
+            imputed_fpts = imputed_fpts + np.where(missing, scoring[stat_]*IMPUTE_PROPS[stat_], 0.0)
+            imputed_e_fpts = imputed_e_fpts + np.where(missing, 0.5*scoring[stat_]*IMPUTE_PROPS[stat_], 0.0)
+            imputed_shorthand = imputed_shorthand + np.where(missing, letter, '')
+
+    imputed_shorthand = np.where(imputed_shorthand != '', '(' + imputed_shorthand + ')', '')
+    past = np.zeros(n_players, dtype=bool)
+    past[group[position == 0]] = props.past.to_numpy()[position == 0]
+
+    # Double-double / triple-double bonus off lines >= 9.5
+    is_double = props.line.to_numpy() >= DOUBLES_LINE
+    doubles = np.bincount(group, weights=is_double, minlength=n_players).astype('int')
+    bonus = pd.Series(doubles).map(DOUBLES_BONUS).fillna(0.0).to_numpy()
+    e_factor = _grouped_product(np.where(is_double, props.true_odds_over.to_numpy(), 1.0), cells, n_players, width)
+
+    return (pd
+        .DataFrame({
+            'fpts': (fpts + imputed_fpts) + bonus,
+            'e_fpts': (e_fpts + imputed_e_fpts) + np.where(bonus > 0.0, e_factor*bonus, 0.0),
+            'props': shorthand + imputed_shorthand + np.where(past, '*', ''),
+        }, index=pd.Index(names, name='name'))
+        .iloc[first_seen]
+    )
+
+
+def project_props(raw: pd.DataFrame, site: str = 'draftkings') -> pd.DataFrame:
+    """Raw prop lines for whole slate -> fpts, e_fpts, props per player in one shot"""
+    return project_players(project_prop_rows(raw, site), site)
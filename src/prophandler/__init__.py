@@ -1,4 +1,11 @@
 from .prophandler import PropHandler
 from .proptracker import PropTracker
+from .prophistory import PropHistory
+from .scheduler import ScrapeScheduler
+from .service import ProjectionService
+from .multisite import MultiSiteHandler
+from .rawprops import RawPropSnapshot
+from .contestfile import ContestFile
+from .injuries import InjuryFeed
 
 version = "1.0.1"
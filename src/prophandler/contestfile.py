@@ -0,0 +1,155 @@
+import os
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass
+
+from .scheduler import GAME_TZ
+from _utils import _clean_names, _clean_teams
+
+# One row per player whatever the site: every PropHandler/MultiSiteHandler consumer reads these
+CONTEST_COLUMNS = ['name', 'pos', 'salary', 'team', 'opp', 'game', 'gametime', 'tipoff', 'fppg', 'games', 'status']
+
+# Site export header -> standard column, only these are read off disk
+SCHEMAS = {
+    'draftkings': {
+        'Name': 'name',
+        'Roster Position': 'pos',
+        'Salary': 'salary',
+        'TeamAbbrev': 'team',
+        'Game Info': 'game_info',
+        'AvgPointsPerGame': 'fppg',
+    },
+    'fanduel': {
+        'Nickname': 'name',
+        'Position': 'pos',
+        'Salary': 'salary',
+        'Team': 'team',
+        'Opponent': 'opp',
+        'Game': 'game',
+        'FPPG': 'fppg',
+        'Played': 'games',
+        'Injury Indicator': 'status',
+    },
+}
+
+
+def _detect_site(path: str) -> str:
+    header = set(pd.read_csv(path, nrows=0).columns)
+    for site, columns in SCHEMAS.items():
+        if set(columns) <= header:
+            return site
+    raise ValueError(f'{path} is neither a DraftKings nor a FanDuel contest export (header: {sorted(header)})')
+
+
+def _parse_gametimes(game_info: pd.Series) -> pd.Series:
+    """'BKN@DEN 01/29/2026 09:00PM ET' -> (9, 0), parsed once per game"""
+    uniques = game_info.drop_duplicates()
+    return game_info.map(dict(zip(uniques, (
+        tuple(int(part) for part in info.replace(' ET', '').replace('AM', '').replace('PM', '').split(' ')[-1].split(':'))
+        for info in uniques
+    ))))
+
+
+def _parse_tipoffs(game_info: pd.Series) -> pd.Series:
+    """'BKN@DEN 01/29/2026 09:00PM ET' -> tz-aware tipoff (NaT if unparseable)"""
+    return (pd
+        .to_datetime(game_info.str.extract(r'(\d{2}/\d{2}/\d{4} \d{2}:\d{2}[AP]M)', expand=False), format='%m/%d/%Y %I:%M%p', errors='coerce')
+        .dt.tz_localize(GAME_TZ)
+    )
+
+
+def _draftkings_frame(df: pd.DataFrame) -> pd.DataFrame:
+    # Showdown lists everyone twice (CPT + UTIL), the CPT row is just salary*1.5
+    df = df.loc[df.pos != 'CPT']
+    teams = df.game_info.str.split(' ', n=1).str[0].str.split('@', expand=True)
+    away, home = _clean_teams(teams[0]), _clean_teams(teams[1])
+
+    return (df
+        .assign(
+            team=lambda df_: _clean_teams(df_.team),
+            opp=lambda df_: np.where(df_.team == away, home, away),
+            game=away + '@' + home,
+            pos=lambda df_: df_.pos.str.replace("/[GF]/UTIL", "", regex=True).str.replace("C/UTIL", "C", regex=False).str.replace("/[GF]", "", regex=True),
+            gametime=lambda df_: _parse_gametimes(df_.game_info),
+            tipoff=lambda df_: _parse_tipoffs(df_.game_info),
+            games=pd.NA,
+            status='',
+        )
+    )
+
+
+def _fanduel_frame(df: pd.DataFrame) -> pd.DataFrame:
+    # No tip times in FD exports: gametime left empty, tipoff NaT (never locks, scheduler treats as far from tip)
+    away, home = (_clean_teams(side) for side in (df.game.str.split('@').str[0], df.game.str.split('@').str[1]))
+
+    return (df
+        .assign(
+            team=lambda df_: _clean_teams(df_.team),
+            opp=lambda df_: _clean_teams(df_.opp),
+            game=away + '@' + home,
+            gametime=[()] * len(df),
+            tipoff=pd.Series(pd.NaT, index=df.index, dtype=f'datetime64[ns, {GAME_TZ}]'),
+            status=lambda df_: df_.status.fillna('').astype('str').str.strip(),
+        )
+    )
+
+
+@dataclass
+class ContestFile:
+    """
+    DraftKings / FanDuel contest export parsed once into one typed row per player
+    - Site detected from the header when not given
+    - frame() reparses only when the file's mtime/size change, so the contest file can be swapped mid-day
+    - Team, opponent, position and game time derived with column-wise string ops, each distinct game parsed once
+    - Use contest_file(path) to share one parse between everything reading the same export
+    """
+    path: str
+    site: str|None = None
+
+    def __post_init__(self):
+        if not self.site:
+            self.site = _detect_site(self.path)
+        self._stamp = None
+        self._frame = None
+
+    def _read(self) -> pd.DataFrame:
+        schema = SCHEMAS[self.site]
+        df = (pd
+            .read_csv(self.path, usecols=list(schema))
+            .rename(schema, axis=1)
+            .assign(name=lambda df_: _clean_names(df_.name))
+        )
+
+        return ({'draftkings': _draftkings_frame, 'fanduel': _fanduel_frame}[self.site](df)
+            .astype({'salary': 'int', 'fppg': 'float64', 'games': 'Int64'})
+            .drop_duplicates('name')
+            .reset_index(drop=True)
+            [CONTEST_COLUMNS]
+        )
+
+    def frame(self) -> pd.DataFrame:
+        """Parsed contest file, reread only if it changed on disk"""
+        stat = os.stat(self.path)
+        stamp = (stat.st_mtime_ns, stat.st_size)
+        if stamp != self._stamp:
+            self._frame, self._stamp = self._read(), stamp
+        return self._frame.copy()
+
+    @property
+    def teams(self) -> int:
+        return self.frame().team.nunique()
+
+    @property
+    def mode(self) -> str:
+        """Two teams on the file -> showdown"""
+        return 'showdown' if self.teams == 2 else 'classic'
+
+
+_CONTEST_FILES = {}
+
+def contest_file(path: str, site: str|None = None) -> ContestFile:
+    """Shared ContestFile per path, every handler on the same export reuses one parse"""
+    key = os.path.abspath(path)
+    if key not in _CONTEST_FILES:
+        _CONTEST_FILES[key] = ContestFile(path=path, site=site)
+    return _CONTEST_FILES[key]
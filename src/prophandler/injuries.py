@@ -0,0 +1,92 @@
+import os
+import pandas as pd
+from dataclasses import dataclass
+
+from designs import DATA_DIR
+from .contestfile import contest_file
+from _utils import _output_msgs
+
+# FanDuel contest export whose Injury Indicator column is the injury source
+# Override with NBA_PROPS_INJURY_FILE or InjuryFeed(path=...) / python -m cli ... --injury-file
+INJURY_FILE = os.environ.get('NBA_PROPS_INJURY_FILE', os.path.join(DATA_DIR, 'current-fanduel.csv'))
+
+STATUSES = {'GTD': 'Game-time Decision', 'P': 'Probable', 'Q': 'Questionable', 'D': 'Doubtful', 'O': 'Out'}
+
+
+@dataclass
+class InjuryFeed:
+    """
+    Players ruled out according to a FanDuel contest export, re-read whenever the file changes
+    - Out + Doubtful players (statuses) among those who matter: salary > 4k or 20+ fppg, 10+ games, <= 6 fppg/1k
+    - refresh() is one os.stat when nothing changed, so it can run every scrape cycle
+    - Missing file -> nobody ruled out (warned once), drop a new export in place and it is picked up
+    """
+    path: str|None = None
+    statuses: tuple[str,...] = ('O', 'D')
+    report: bool = False
+
+    def __post_init__(self):
+        if not self.path:
+            self.path = INJURY_FILE
+        self._contest = None
+        self._stamp = None
+        self._warned = False
+        self.out = []
+
+    def _stat(self) -> tuple[int,int]|None:
+        try:
+            stat = os.stat(self.path)
+        except FileNotFoundError:
+            return None
+        return (stat.st_mtime_ns, stat.st_size)
+
+    def _read(self) -> pd.DataFrame:
+        return (self._contest
+            .frame()
+            .pipe(lambda df_: df_.loc[
+                ((df_.salary > 4_000) | (df_.fppg >= 20.0))
+                & (df_.games.fillna(0) >= 10)
+                & (1_000 * (df_.fppg / df_.salary) <= 6.0)
+            ])
+            .sort_values('salary', ascending=False)
+        )
+
+    def _report(self, df: pd.DataFrame) -> None:
+        msgs = []
+        for status, label in STATUSES.items():
+            players = df.loc[df.status == status]
+            if players.empty:
+                continue
+            msgs.append(f'{label}:')
+            for team, team_players in players.groupby('team', sort=False):
+                msgs += [f' * {team}:'] + [f'    - {name}' for name in team_players.name]
+        if msgs:
+            _output_msgs(msgs, char='*')
+        return
+
+    def refresh(self) -> tuple[list[str,...], list[str,...]]:
+        """Re-reads the feed if it changed on disk -> (newly ruled out, no longer ruled out)"""
+        stamp = self._stat()
+        if stamp == self._stamp:
+            return [], []
+        self._stamp = stamp
+
+        if self._contest is None and stamp is not None:
+            self._contest = contest_file(self.path)
+
+        if stamp is None or self._contest.site != 'fanduel':
+            if not self._warned:
+                _output_msgs([f'No FanDuel injury file at {self.path}, nobody dropped for injuries'], warning=True)
+                self._warned = True
+            out = []
+        else:
+            df = self._read()
+            if self.report:
+                self._report(df)
+            out = sorted(df.loc[df.status.isin(self.statuses)].name)
+
+        ruled_out = sorted(set(out) - set(self.out))
+        returning = sorted(set(self.out) - set(out))
+        self.out = out
+
+        return ruled_out, returning
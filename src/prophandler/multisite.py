@@ -0,0 +1,154 @@
+import time
+import random
+import pandas as pd
+from dataclasses import dataclass, field
+
+from propscraper import PropScraper
+from .prophandler import PropHandler
+from .proptracker import PropTracker
+from .scheduler import ScrapeScheduler
+from _metrics import METRICS
+from _writer import WRITER
+from _utils import _output_msgs, _timeit
+
+
+@dataclass
+class MultiSiteHandler:
+    """
+    Several site/mode contest files fed from one scrape of scoresandodds
+    - Raw props are site independent, so the union of all contest files is fetched once per cycle
+    - Each (site, mode) gets its own PropHandler for scoring, output file and labelled PropTracker
+    - First target does the fetching (scraper, scheduler, locked games, PropHistory)
+    - handler_kwargs: passed to every PropHandler (drop, edits, verbose, ...), not site/mode/scraper/tracker or
+        input_file/output_file/contest (set per target here, anything shared would have every site on one file)
+    - input_files / output_files: {(site, mode): path} for targets off the default data/current-*.csv / output paths
+    - Drop-in for PropHandler in ProjectionService: constant_scrape takes the same on_update/stop,
+        the service gets the first target's slate and tracker
+    """
+    targets: list[tuple[str,str],...] = field(default_factory=lambda: [('draftkings', 'classic'), ('fanduel', 'classic')])
+    handler_kwargs: dict = field(default_factory=dict)
+    scraper: PropScraper|None = None
+    input_files: dict[tuple[str,str], str] = field(default_factory=dict)
+    output_files: dict[tuple[str,str], str] = field(default_factory=dict)
+
+    def __post_init__(self):
+        per_target = sorted({'site', 'mode', 'scraper', 'tracker', 'input_file', 'output_file', 'contest'} & set(self.handler_kwargs))
+        if per_target:
+            raise ValueError(f'handler_kwargs can\'t set {", ".join(per_target)}, MultiSiteHandler sets them per target (paths go in input_files/output_files)')
+
+        self.handlers = {}
+        for site, mode in self.targets:
+            handler = PropHandler(
+                site=site,
+                mode=mode,
+                input_file=self.input_files.get((site, mode)),
+                output_file=self.output_files.get((site, mode)),
+                scraper=self.scraper,
+                tracker=PropTracker(label=f'{site}-{mode}', writer=self.handler_kwargs.get('writer', WRITER)),
+                **self.handler_kwargs,
+            )
+            # Everyone shares the first handler's scraper (session, caches, directory)
+            self.scraper = handler.scraper
+            self.handlers[(site, mode)] = handler
+
+        self.primary = next(iter(self.handlers.values()))
+
+    @property
+    def tracker(self) -> PropTracker:
+        return self.primary.tracker
+
+    def _contest_frame(self) -> pd.DataFrame:
+        """Everyone on any target's contest file, indexed by name: highest salary, tipoff"""
+        return (pd
+            .concat([handler._load_contest_frame() for handler in self.handlers.values()], ignore_index=True)
+            .groupby('name')
+            .agg({'salary': 'max', 'tipoff': 'first'})
+        )
+
+    def _scrape_cycle(self, names: list[str,...]|None = None, **kwargs) -> dict[tuple[str,str], pd.DataFrame]:
+        """Fetch once, score for every target -> {} while some player has never been fetched (nothing written)"""
+        frames = {key: handler._load_contest_frame() for key, handler in self.handlers.items()}
+
+        # Same player can be on several contest files -> fetched once
+        slate = pd.concat(frames.values(), ignore_index=True).drop_duplicates('name')
+        raw = self.primary._fetch_raw_props(slate, names)
+        if not set(slate.name) <= self.primary._fetched:
+            return {}
+
+        return {
+            key: handler._post_scrape_processing(handler._project_frame(frames[key], raw), **kwargs)
+            for key, handler in self.handlers.items()
+        }
+
+    @_timeit
+    def load(self, **kwargs) -> dict[tuple[str,str], pd.DataFrame]:
+        """PropHandler.load for every target off a single scrape"""
+        if kwargs.get("update", kwargs.get("run", True)):
+            _output_msgs(f'Beginning WebScrape of NBA Player Props for {", ".join("-".join(key) for key in self.handlers)}.')
+            self._scrape_cycle()
+            METRICS.incr('cycles')
+            METRICS.flush()
+
+        return {key: handler.load_slate(**kwargs) for key, handler in self.handlers.items()}
+
+    def rescore(self, **kwargs) -> dict[tuple[str,str], pd.DataFrame]:
+        """PropHandler.rescore for every target off the same raw props"""
+        primary = self.primary
+        raw = primary._raw_props if primary._raw_props is not None else primary.raw_snapshot.load()
+        return {key: handler.rescore(raw=raw, **kwargs) for key, handler in self.handlers.items()}
+
+    @_timeit
+    def constant_scrape(self, max_runs: int = 100, **kwargs):
+        """
+        Same loop as PropHandler.constant_scrape, one fetch per player per cycle whatever the number of targets
+        - requests_per_minute: fetch budget when the first target has no scheduler (default 60)
+        - on_update: called with the first target's processed slate after every run once the whole slate has been
+            fetched (ProjectionService hooks in here)
+        - stop: threading.Event, ends the loop as soon as it is set instead of after max_runs
+        """
+        primary = self.primary
+        if primary.scheduler is None:
+            primary.scheduler = ScrapeScheduler(requests_per_minute=kwargs.get('requests_per_minute', 60))
+
+        on_update = kwargs.get('on_update')
+        stop = kwargs.get('stop')
+
+        # Everyone on any contest file due straight away, the first run spends request tokens like every other one
+        primary.scheduler.sync(self._contest_frame())
+
+        total_runs = 0
+        while True:
+            output_movement = False
+            if total_runs == 0:
+                _output_msgs(['Initialized constant PropScraper'])
+            elif not total_runs % 10:
+                output_movement = True
+                _output_msgs([f'Performing scrape #{total_runs}', str(primary.scheduler.summary())])
+
+            self.scraper.refresh_webpage_directory()
+            primary.scheduler.expedite(sorted(set().union(*(handler._refresh_injuries() for handler in self.handlers.values()))))
+            names = primary.scheduler.due()
+            slates = self._scrape_cycle(names, output_movement=output_movement)
+
+            # Only players in games yet to tip (or locked before their first fetch) stay in the queue
+            contests = self._contest_frame()
+            primary.scheduler.sync(contests.loc[~contests.index.isin(primary.locked & primary._fetched)])
+            if not slates:
+                _output_msgs([f'First pass: {len(primary._fetched & set(contests.index))}/{len(contests)} players fetched'])
+            elif on_update:
+                on_update(slates[next(iter(self.handlers))])
+            # Moved on any site counts as moved
+            moved = pd.concat([handler.tracker.data().just_moved for handler in self.handlers.values()]).groupby(level=0).max()
+            primary.scheduler.reschedule(names, moved)
+            METRICS.incr('cycles')
+            METRICS.flush()
+
+            total_runs += 1
+            if stop:
+                if stop.wait(random.randint(30,60)):
+                    break
+            else:
+                time.sleep(random.randint(30,60))
+            if total_runs > max_runs:
+                break
+        return
@@ -2,16 +2,26 @@ import os
 import random
 import time
 import datetime
+import numpy as np
 import pandas as pd
 from dataclasses import dataclass, field
 
 from propscraper import PropScraper
 from .proptracker import PropTracker
+from .prophistory import PropHistory
+from .scheduler import ScrapeScheduler, GAME_TZ
+from .rawprops import RawPropSnapshot
+from .contestfile import ContestFile, contest_file
+from .injuries import InjuryFeed
 from designs import _load_data_dir
+from archive import HistoricalArchive
+from projections import project_prop_rows, project_props
+from simulation import simulate_props
+from lineups import LineupGenerator
+from _metrics import METRICS
+from _writer import WriteBehind, WRITER
 from _utils import (
-    _clean_name,
-    _clean_team,
-    _load_injuries,
+    _display,
     _output_msgs,
     _timeit,
 )
@@ -25,6 +35,7 @@ class PropHandler:
     input_file: str|None = None
     output_file: str|None = None
     constant: bool = False
+    offline: bool = False # read only (load_slate/simulate/lineups): no scraper, directory, tracker or history set up
     verbose: bool = False
     drop: list[str,...] = field(default_factory=list)
     edits: dict[str,float] = field(default_factory=dict)
@@ -34,6 +45,14 @@ class PropHandler:
     scraper: PropScraper|None = None
     scraper_kwargs: dict[str,bool] = field(default_factory=dict)
     tracker: PropTracker|None = None
+    prop_history: PropHistory|None = None
+    scheduler: ScrapeScheduler|None = None
+    raw_snapshot: RawPropSnapshot|None = None
+    archive: HistoricalArchive|None = None
+    contest: ContestFile|None = None
+    injury_file: str|None = None
+    injuries: InjuryFeed|None = None
+    writer: WriteBehind|None = None
 
     def __post_init__(self):
 
@@ -43,7 +62,13 @@ class PropHandler:
                 f'current-{self.site}{"-sg" if self.mode == "showdown" else ""}.csv'
             )
         
-        if len(set(pd.read_csv(self.input_file).set_index('Name').TeamAbbrev)) == 2:
+        if self.contest is None:
+            self.contest = contest_file(self.input_file)
+
+        if self.contest.site != self.site:
+            _output_msgs([f'{self.input_file} is a {self.contest.site} export, scoring it for {self.site}'], warning=True)
+
+        if self.contest.mode == 'showdown':
             self.mode = 'showdown'
         
         if not self.output_file:
@@ -52,11 +77,36 @@ class PropHandler:
                 f'{self.site}-props{"-sg" if self.mode == "showdown" else ""}.csv'
             )
             
-        self.drop += _load_injuries()
+        # Manual drops stay out whatever the injury feed says, injured players come and go with it
+        if self.injuries is None:
+            self.injuries = InjuryFeed(path=self.injury_file)
+        self._manual_drop = list(self.drop)
+        self._refresh_injuries(announce=False)
 
         if isinstance(self.override_edits, list):
             self.override_edits = {name_: self.edits[name_] for name_ in self.override_edits}
-            
+
+        # Output/archive/tracker files written off the scrape loop, shared process wide unless one is passed in
+        if self.writer is None:
+            self.writer = WRITER
+
+        if self.raw_snapshot is None:
+            self.raw_snapshot = RawPropSnapshot(writer=self.writer)
+
+        # Last raw prop table for the whole slate, partial scrapes are merged into it
+        self._raw_props = None
+        # Last processed slate, load_slate starts from it instead of reading output_file back
+        self._slate = None
+        self._tipoffs = pd.Series(dtype=f'datetime64[ns, {GAME_TZ}]')
+        # Players fetched at least once today, only these can be frozen once their game locks
+        self._fetched = set()
+        self.locked = set()
+        self.locked_games = set()
+
+        # Nothing below runs for a read only handler: no network, no tracker/history directories created
+        if self.offline:
+            return
+
         if not self.scraper:
             if not self.scraper_kwargs:
                 self.scraper_kwargs = {'site': self.site}
@@ -65,66 +115,118 @@ class PropHandler:
                 
             self.scraper = PropScraper(**self.scraper_kwargs)
 
-        self.directory = self.scraper.create_webpage_directory()
-        
-        if not self.tracker:
-            self.tracker = PropTracker()
+        self.directory = self.scraper.load_webpage_directory()
 
-    @staticmethod
-    def _parse_gametime_str(gametime_str: str) -> str:
-        return tuple(
-            int(part)
-            for part in gametime_str.replace(' ET', '').replace('AM', '').replace('PM', '').split(' ')[-1].split(':')
-        )
+        if self.tracker is None:
+            self.tracker = PropTracker(writer=self.writer)
 
-    def _run_prop_scrape(self, name: str, team: str) -> tuple[float,float,str]:
-        try:
-            return self.scraper.scrape_player_props(
-                name,
-                self.directory[team][name],
-                self.site,
-                team,
-            )
-        except KeyError:
-            return (0.0, 0.0, '---')
+        if not self.prop_history:
+            self.prop_history = PropHistory(writer=self.writer)
+
+        if self.archive is None:
+            self.archive = HistoricalArchive(site=self.site, mode=self.mode, writer=self.writer)
 
-    def _clean_and_scrape_data(self):
+    def _update_locked(self, df: pd.DataFrame) -> None:
+        """
+        Games whose tipoff has passed are locked for the rest of the night
+        - df: contest frame with name, team, opp, tipoff
+        """
+        locked = df.loc[df.tipoff <= pd.Timestamp.now(tz=GAME_TZ)]
+        games = set(np.where(locked.team < locked.opp, locked.team + '/' + locked.opp, locked.opp + '/' + locked.team)) - self.locked_games
+        self.locked = set(locked.name)
 
-        columns = {
-            "Name": "name",
-            "Roster Position": "pos",
-            "TeamAbbrev": "team",
-            "Salary": "salary",
-            'Game Info': 'game',
-        }
+        if games:
+            self.locked_games.update(games)
+            _output_msgs([
+                f'Locked: {", ".join(sorted(games))}',
+                f'{len(self.locked)} players frozen, {len(df) - len(self.locked)} still active',
+            ])
 
+        return
 
-        df = (pd
-            .read_csv(self.input_file, usecols=columns)
-            .rename(columns, axis=1)
-            .assign(
-                name=lambda df_: df_.name.apply(_clean_name),
-                salary=lambda df_: df_.salary.astype('int'),
-                team=lambda df_: df_.team.apply(_clean_team),
-                pos=lambda df_: df_.pos.str.replace("/[GF]/UTIL", "", regex=True).str.replace("C/UTIL", "C", regex=False).str.replace("/[GF]", "", regex=True),
-                opp=lambda df_: df_[['game', 'team']].apply(lambda row: [_clean_team(team_) for team_ in row.game.split(' ')[0].split('@') if _clean_team(team_) != _clean_team(row.team)].pop(), axis=1),
-                gametime=lambda df_: df_.game.apply(self._parse_gametime_str)
+    def _refresh_injuries(self, announce: bool = True) -> list[str,...]:
+        """
+        Re-checks the injury feed (cheap when the file hasn't changed), drop = manual drops + ruled out
+        - Returns players no longer ruled out, they need fetching again
+        """
+        ruled_out, returning = self.injuries.refresh()
+        if not ruled_out and not returning:
+            return []
+
+        self.drop = sorted(set(self._manual_drop) | set(self.injuries.out))
+        returning = [name for name in returning if name not in self._manual_drop]
+
+        if announce:
+            _output_msgs(
+                ([f'Ruled out: {", ".join(ruled_out)}'] if ruled_out else [])
+                + ([f'Back from injury: {", ".join(returning)}'] if returning else [])
             )
-            .pipe(lambda df_: df_.loc[(df_.pos != "CPT") & (df_.name.isin(self.drop) == False), ['name', 'pos', 'salary', 'team', 'opp', 'gametime']])
-             )
 
+        return returning
 
-        df['input'] = tuple(zip(df.name, df.team))
-        df["output"] = df.input.apply(lambda x: self._run_prop_scrape(*x))
+    def _scrape_raw_props(self, inputs: list[tuple[str,str],...]) -> pd.DataFrame:
+        """
+        - Concurrent scrape of the whole slate into one long table of raw props
+        - Players missing from directory never hit the network
+        """
+        return self.scraper.scrape_slate_raw([
+            (name, self.directory[team][name], team)
+            for name, team in inputs
+            if name in self.directory.get(team, {})
+        ])
+
+    def _load_contest_frame(self) -> pd.DataFrame:
+        """Contest file (DK or FD, parsed once per change on disk) -> one row per player: name, pos, salary, team, opp, gametime, tipoff"""
+        return (self.contest
+            .frame()
+            .pipe(lambda df_: df_.loc[df_.name.isin(self.drop) == False, ['name', 'pos', 'salary', 'team', 'opp', 'gametime', 'tipoff']])
+        )
+
+    def _fetch_raw_props(self, df: pd.DataFrame, names: list[str,...]|None = None) -> pd.DataFrame:
+        """
+        Raw prop table for every player in df (contest frame), fetching as little as possible
+        - names: only fetch these players, everyone else carries forward their last raw props
+        - Locked games are frozen: no fetch, last raw props carried forward
+        - Freshly fetched props are filed in PropHistory
+        """
+        self._tipoffs = df.set_index('name').tipoff
+        self._update_locked(df)
+
+        scrape = df.loc[~df.name.isin(self.locked & self._fetched)]
+        if names is not None:
+            scrape = scrape.loc[scrape.name.isin(names)]
+
+        fresh = (self
+            ._scrape_raw_props(list(zip(scrape.name, scrape.team)))
+            .assign(scrape_time=pd.Timestamp.now().floor('s'))
+        )
+        self._fetched.update(scrape.name)
 
-        df["fpts"] = df.output.map(lambda x: x[0])
-        df["e_fpts"] = df.output.map(lambda x: x[1])
-        df["props"] = df.output.map(lambda x: x[2])
+        # Only props fetched this cycle are filed, carried forward ones are already in history
+        self.prop_history.append(project_prop_rows(fresh, self.site))
 
-        # df[['fpts', 'e_fpts', 'props']] = df[['name', 'team']].apply(lambda row: self._run_prop_scrape(row.name, row.team), axis=1)
+        raw = fresh
+        if self._raw_props is not None:
+            carried = self._raw_props.loc[self._raw_props.name.isin(df.name) & ~self._raw_props.name.isin(scrape.name)]
+            raw = pd.concat([carried, fresh], ignore_index=True) if not fresh.empty else carried.reset_index(drop=True)
+        self._raw_props = raw
+        self.raw_snapshot.save(raw)
+
+        return raw
+
+    def _project_frame(self, df: pd.DataFrame, raw: pd.DataFrame) -> pd.DataFrame:
+        """Contest frame + raw prop table -> fpts, e_fpts, props scored for this site/mode"""
+
+        # Whole slate projected in one shot from raw lines/odds
+        with METRICS.span('projection', site=self.site, mode=self.mode, rows=len(raw)):
+            projected = project_props(raw, self.site).reindex(df.name)
+
+        df = df.drop('tipoff', axis=1)
+        df["fpts"] = projected.fpts.fillna(0.0).to_numpy()
+        df["e_fpts"] = projected.e_fpts.fillna(0.0).to_numpy()
+        df["props"] = projected.props.fillna('---').to_numpy()
 
         df = (df
-              .drop(["input", "output"], axis=1)
               .set_index("name")
               # .round(2)
         )
@@ -141,90 +243,134 @@ class PropHandler:
 
         return df
 
-    def _post_scrape_processing(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
+    def _clean_and_scrape_data(self, names: list[str,...]|None = None, raw: pd.DataFrame|None = None):
+        """
+        - names: only fetch these players, everyone else carries forward their last raw props
+        - None fetches the whole slate
+        - raw: already scraped raw prop table (MultiSiteHandler), nothing fetched
+        """
+        df = self._load_contest_frame()
+        if raw is None:
+            raw = self._fetch_raw_props(df, names)
 
-        names_in_edits = set(self.edits.keys())
-        names_in_props = set(df.loc[df['fpts'] > 0.0].index)
+        return self._project_frame(df, raw)
 
-        if not self.constant:
-            print(f'Prop projection only: {str([name for name in names_in_props if name not in names_in_edits])}')
-        
-        for name, edit in self.edits.items():
-            # Check if has prop projection
-            fpts = df.fpts.get(name, 0.0) #loc[name, 'fpts'] if name in df.index else -1
+    @staticmethod
+    def _adjust_projections(
+        df: pd.DataFrame,
+        edits: dict[str,float],
+        override_edits: dict[str,float],
+        normalize_chalk: bool,
+        open_values: pd.DataFrame|None = None,
+    ) -> pd.DataFrame:
+        """
+        Edits, overrides, chalk normalization, $ values and open/movement for the whole slate in one pass
+        - edits: only fill players without a prop projection (props -> '---')
+        - override_edits: replace prop projection regardless
+        - Both at e_fpts = 0.5*fpts, names not on the slate are ignored
+        - open_values: PropTracker.open_values(), players without one (or no tracker at all) open at their current value
+        """
+        edits = pd.Series(edits, dtype='float64').reindex(df.index)
+        overrides = pd.Series(override_edits, dtype='float64').reindex(df.index)
+        use_edit = edits.notna() & (df.fpts == 0.0)
+        use_override = overrides.notna()
 
-            if not fpts:
-                # If no prop projection
-                df.loc[name, 'fpts'] = edit
-                df.loc[name, 'e_fpts'] = 0.5*edit
-                df.loc[name, 'props'] = '---'
+        fpts = df.fpts.mask(use_edit, edits).mask(use_override, overrides)
+        e_fpts = df.e_fpts.mask(use_edit, 0.5*edits).mask(use_override, 0.5*overrides)
+        props = df.props.mask(use_edit, '---')
 
-                
-        for name, override_edit in self.override_edits.items():
-            if self.verbose:
-                print(f'Overriding prop projection for {name}: {df.loc[name, "fpts"]} -> {override_edit} ')
-            df.loc[name, 'fpts'] = override_edit
-            df.loc[name, 'e_fpts'] = 0.5*override_edit
+        if normalize_chalk:
+            chalk = (props == '---') & (1_000 * (fpts / df.salary) >= 4.7)
+            fpts = fpts.mask(chalk, ((df.salary / 1000) * 5.0).round(2))
+            e_fpts = e_fpts.mask(chalk, (fpts / 2).round(2))
 
-        for col in ("fpts", "e_fpts"):
-            df[f"{col}/$"] = 1_000 * (df[col] / df.salary)
+        df = (df
+            .assign(**{
+                'fpts': fpts,
+                'e_fpts': e_fpts,
+                'props': props,
+                'fpts/$': 1_000 * (fpts / df.salary),
+                'e_fpts/$': 1_000 * (e_fpts / df.salary),
+            })
+            .pipe(lambda df_: df_.loc[df_.fpts > 0.0])
+            .dropna()
+            .assign(salary=lambda df_: df_.salary.astype('int'))
+        )
 
-        if self.normalize_chalk:
-            df.loc[(df.props == '---') & (df['fpts/$'] >= 4.7), 'fpts'] = ((df.salary / 1000) * 5.0).round(2)
-            df.loc[(df.props == '---') & (df['fpts/$'] >= 4.7), 'e_fpts'] = (df.loc[(df.props == '---') & (df['fpts/$'] >= 4.7)].fpts / 2).round(2)
-            for col in ("fpts", "e_fpts"): df[f"{col}/$"] = 1_000 * (df[col] / df.salary)
+        if open_values is None:
+            open_values = df[['fpts', 'e_fpts']].set_axis(['props_open', 'e_props_open'], axis=1)
+        open_ = open_values.props_open.round(3).reindex(df.index).fillna(0.0)
+        e_open = open_values.e_props_open.round(3).reindex(df.index).fillna(0.0)
 
-        df = df.loc[df.fpts > 0.0].dropna().assign(salary=lambda df_: df_.salary.astype('int'))
+        return (df
+            .assign(
+                open=open_.mask(open_ == 0.0, df.fpts),
+                e_open=e_open.mask((e_open == 0.0) & (df.e_fpts > 0.0), df.e_fpts),
+            )
+            .assign(
+                movement=lambda df_: (df_.fpts-df_.open).round(3),
+                e_movement=lambda df_: (df_.e_fpts-df_.e_open).round(3),
+            )
+        )
 
-        open_props = self.tracker.data().props_open.round(3).to_dict() if self.tracker else df.fpts.round(3).to_dict()
-        open_e_props = self.tracker.data().e_props_open.round(3).to_dict() if self.tracker else df.e_fpts.round(3).to_dict()
+    def _post_scrape_processing(self, df: pd.DataFrame, **kwargs) -> pd.DataFrame:
 
-        df['open'] = df.index.map(lambda name: open_props.get(name, 0.0))
-        df['e_open'] = df.index.map(lambda name: open_e_props.get(name, 0.0))
+        names_in_edits = set(self.edits.keys())
+        names_in_props = set(df.loc[df['fpts'] > 0.0].index)
 
-        df.loc[(df.open == 0.0) & (df.fpts > 0.0), 'open'] = df.loc[(df.open == 0.0) & (df.fpts > 0.0), 'fpts']
-        df.loc[(df.e_open == 0.0) & (df.e_fpts > 0.0), 'e_open'] = df.loc[(df.open == 0.0) & (df.e_fpts > 0.0), 'e_fpts']
+        if not self.constant:
+            print(f'Prop projection only: {str([name for name in names_in_props if name not in names_in_edits])}')
+        
+        if self.verbose:
+            for name in df.index.intersection(list(self.override_edits)):
+                print(f'Overriding prop projection for {name}: {df.loc[name, "fpts"]} -> {self.override_edits[name]} ')
 
-        df['movement'] = (df.fpts-df.open).round(3)
-        df['e_movement'] = (df.e_fpts-df.e_open).round(3)
+        with METRICS.span('post_processing', site=self.site, mode=self.mode):
+            open_values = self.tracker.open_values() if self.tracker else None
+            df = self._adjust_projections(df, self.edits, self.override_edits, self.normalize_chalk, open_values)
 
         if self.verbose:
             for name, row in df.loc[df.movement != 0.0, ['fpts', 'open', 'movement']].iterrows():
                 print(f'Prop movement for {name}: {row["open"]} -> {row["fpts"]} = {row["movement"]} move')
 
-        historical_path = os.path.join(DATA_DIR, 'historical', f'{datetime.date.today().isoformat()}.csv')
+        date_str = datetime.date.today().isoformat()
         output_movement = kwargs.get('output_movement', False)
         
         if any([
-            all([not self.constant, os.path.exists(historical_path), not df.loc[df.movement > 0.0].empty]),
+            all([not self.constant, date_str in self.archive, not df.loc[df.movement > 0.0].empty]),
             all([self.constant, output_movement])
         ]):
 
             n_display = 5 if self.constant else 10
             
             print('Biggest movers (fpts):')
-            display(df.assign(swing=lambda df_: abs(df_.movement)).sort_values('swing', ascending=False).drop('swing', axis=1).head(n_display))
+            _display(df.assign(swing=lambda df_: abs(df_.movement)).sort_values('swing', ascending=False).drop('swing', axis=1).head(n_display))
 
             print('Biggest movers (e_fpts):')
-            display(df.assign(swing=lambda df_: abs(df_.e_movement)).sort_values('swing', ascending=False).drop('swing', axis=1).head(n_display))
+            _display(df.assign(swing=lambda df_: abs(df_.e_movement)).sort_values('swing', ascending=False).drop('swing', axis=1).head(n_display))
         else:
             if not self.constant:
                 _output_msgs(['No prop movement since last scrape.'])
             
-        df.to_csv(historical_path)
-        df.to_csv(self.output_file)
-
-        self.tracker.update(df[['fpts', 'e_fpts']])
-
         # Exporting to main (private) codebase containing models/model weights, season data, ownership, optimizer, etc
         # The file private.py contains info which should not be public, thus is kept in .gitignore
+        exports = [self.output_file]
         if os.path.exists(os.path.join(os.getcwd().split("/src")[0], "src", "private.py")):
             import private
+            exports += [path.format(site="draftkings") for path in private.EXPORT_TEMPLATES]
 
-            for path in private.EXPORT_TEMPLATES:
-                df.to_csv(path.format(site="draftkings"))
+        # Only queued here, self.writer serializes the slate once for every export and writes in the background
+        with METRICS.span('export', site=self.site, mode=self.mode, players=len(df)):
+            self.archive.write(df, date_str)
+            self.writer.write_csv(df, exports)
+        self._slate = df
 
-        return
+        # Rescoring only changes how props are turned into fpts, not the lines themselves
+        if kwargs.get('track', True):
+            with METRICS.span('tracker_write', site=self.site, mode=self.mode):
+                self.tracker.update(df[['fpts', 'e_fpts']])
+
+        return df
 
     def player_distribution(self, df: pd.DataFrame) -> pd.DataFrame:
         """
@@ -237,8 +383,7 @@ class PropHandler:
               .sort_values("num-players", ascending=False)
              )
 
-        team_column = "TeamAbbrev" if self.site == "draftkings" else "Team"
-        total_teams = len(pd.read_csv(self.input_file, usecols=[team_column])[team_column].drop_duplicates())
+        total_teams = self.contest.teams
 
         _output_msgs([
             f"{df.shape[0]} teams total",
@@ -252,17 +397,20 @@ class PropHandler:
         """
         Designed so that you can reload data without having to do full scrape
         (example: ownership edits input, updated injury so want to drop, etc.)
+        - Starts from this session's last processed slate, output_file only read when there isn't one yet
+        - Rewritten output_file queued on self.writer, replaces the scrape's copy if that hasn't hit disk yet
+            (offline handlers only read it)
         """
+        slate = self._slate if self._slate is not None else pd.read_csv(self.output_file).set_index("name")
 
-        df = (pd
-            .read_csv(self.output_file)
-            .pipe(lambda df_: df_.loc[df_["name"].isin(self.drop) == False])
-            .set_index("name")
+        df = (slate
+            .pipe(lambda df_: df_.loc[df_.index.isin(self.drop) == False])
             .assign(own=lambda df_: df_.index.map(lambda name: self.ownership.get(name, 0.1)))
             .sort_values(kwargs.get('sort', 'e_fpts/$'), ascending=False)
              )
 
-        df.to_csv(self.output_file)
+        if not self.offline:
+            self.writer.write_csv(df, [self.output_file])
 
         _output_msgs([f"{len(df)} total players".upper(), self.player_distribution(df)])
 
@@ -272,23 +420,83 @@ class PropHandler:
     def load(self, **kwargs) -> pd.DataFrame:
 
         update = kwargs.get("update", kwargs.get("run", True))
+        if update and self.offline:
+            raise ValueError('Offline PropHandler can\'t scrape, use load(update=False)')
 
         if update:
             _output_msgs("Beginning WebScrape of NBA Player Props.")
+            self._refresh_injuries()
             self._post_scrape_processing( self._clean_and_scrape_data() )
+            METRICS.incr('cycles')
+            METRICS.flush()
         
         return self.load_slate(**kwargs)
 
 
+    def rescore(self, raw: pd.DataFrame|None = None, **kwargs) -> pd.DataFrame:
+        """
+        Rebuilds projections from the last raw props without touching the network
+        - For changes to edits, override_edits, drop, normalize_chalk, SCORING/IMPUTE_PROPS, ...
+        - Uses in-memory raw props from this session, otherwise today's RawPropSnapshot on disk
+        - Output files rewritten, PropTracker left alone (lines didn't move)
+        """
+        if raw is None:
+            raw = self._raw_props if self._raw_props is not None else self.raw_snapshot.load()
+
+        self._refresh_injuries()
+        self._post_scrape_processing(self._project_frame(self._load_contest_frame(), raw), track=False)
+        return self.load_slate(**kwargs)
+
+    def simulate(self, raw: pd.DataFrame|None = None, **kwargs) -> pd.DataFrame:
+        """
+        Monte Carlo fpts distribution (simulation.simulate_props) for everyone on the slate with props
+        - Same raw props as rescore: this session's, otherwise today's RawPropSnapshot
+        - kwargs: n_samples, seed, percentiles, chunk_size
+        """
+        if raw is None:
+            raw = self._raw_props if self._raw_props is not None else self.raw_snapshot.load()
+
+        return simulate_props(raw.loc[raw.name.isin(self._load_contest_frame().name)], self.site, **kwargs)
+
+    def lineups(self, n_lineups: int = 150, **kwargs) -> pd.DataFrame:
+        """
+        Top salary-cap lineups (lineups.LineupGenerator) off the last projections (this session's, else output_file), dropped players left out
+        - kwargs: value, max_exposure, min_unique, exclude, pool_factor, workers
+        """
+        slate = self._slate if self._slate is not None else pd.read_csv(self.output_file).set_index("name")
+        slate = slate.loc[slate.index.isin(self.drop) == False]
+
+        return LineupGenerator(slate, site=self.site, mode=self.mode, **kwargs).generate(n_lineups)
+
     @_timeit
     def constant_scrape(self, max_runs: int = 100, **kwargs):
         """
         - Constantly scrapes so always have most update files
         - Works with PropTracker to give line movement on all 
             props and fpts for all players throughout the day
-        - Need to be wary of rate limits, IP blocked, etc.
+        - ScrapeScheduler picks who gets fetched every run, first one included (whole slate queued up front,
+            fetched as fast as the request budget allows, then recent movers, high salaries, games about
+            to tip first, stale players backed off)
+        - Nothing written or published until every player has been fetched once (no load() beforehand ->
+            first runs only fill in raw props), a partial slate never replaces the output file
+        - Games that have tipped are frozen at their last projection and drop out of the queue
+        - requests_per_minute: fetch budget when no scheduler passed in (default 60)
+        - on_update: called with the processed slate after every run (ProjectionService hooks in here)
+        - stop: threading.Event, ends the loop as soon as it is set instead of after max_runs
+        - Injury feed re-checked every run: newly ruled out players dropped, returning players go to the
+            front of the queue (still within the request budget)
+        - Stage timings and scrape counters flushed to data/metrics after every run (_metrics.METRICS)
         - Default max = 100
         """
+        if self.scheduler is None:
+            self.scheduler = ScrapeScheduler(requests_per_minute=kwargs.get('requests_per_minute', 60))
+
+        on_update = kwargs.get('on_update')
+        stop = kwargs.get('stop')
+
+        # Everyone due straight away, the first run spends request tokens like every other one
+        self.scheduler.sync(self._load_contest_frame().set_index('name')[['salary', 'tipoff']])
+
         total_runs = 0
         while True:
             output_movement = False
@@ -296,11 +504,32 @@ class PropHandler:
                 _output_msgs(['Initialized constant PropScraper'])
             elif not total_runs % 10:
                 output_movement = True
-                _output_msgs([f'Performing scrape #{total_runs}'])
-            self._post_scrape_processing( self._clean_and_scrape_data(), output_movement=output_movement )
+                _output_msgs([f'Performing scrape #{total_runs}', str(self.scheduler.summary())])
+
+            self.scraper.refresh_webpage_directory()
+            # Ruled out players leave the contest frame (and the queue on sync), returning ones are fetched first
+            self.scheduler.expedite(self._refresh_injuries())
+            names = self.scheduler.due()
+            df = self._clean_and_scrape_data(names=names)
+            # Only players in games yet to tip (or locked before their first fetch) stay in the queue
+            active = df.loc[~df.index.isin(self.locked & self._fetched), ['salary']]
+            self.scheduler.sync(active.assign(tipoff=self._tipoffs.reindex(active.index)))
+            if set(df.index) <= self._fetched:
+                slate = self._post_scrape_processing(df, output_movement=output_movement)
+                if on_update:
+                    on_update(slate)
+            else:
+                _output_msgs([f'First pass: {len(self._fetched & set(df.index))}/{len(df)} players fetched'])
+            self.scheduler.reschedule(names, self.tracker.data().just_moved)
+            METRICS.incr('cycles')
+            METRICS.flush()
 
             total_runs += 1
-            time.sleep(random.randint(30,60))
+            if stop:
+                if stop.wait(random.randint(30,60)):
+                    break
+            else:
+                time.sleep(random.randint(30,60))
             if total_runs > max_runs:
                 break
-        return
\ No newline at end of file
+        return
@@ -0,0 +1,130 @@
+import os
+import glob
+import datetime
+import pandas as pd
+from dataclasses import dataclass
+
+from designs import DATA_DIR, CONTEST_DATE_STR
+from _writer import WriteBehind
+
+# One directory of parquet parts per date: data/playerprops/{date}/part-00000.parquet, ...
+PROPS_DIR = os.path.join(DATA_DIR, 'playerprops')
+
+HISTORY_COLUMNS = [
+    'scrape_time',
+    'name',
+    'stat',
+    'value',
+    'odds_over',
+    'odds_under',
+    'implied_odds_over',
+    'implied_odds_under',
+    'vig',
+    'true_odds_over',
+    'true_odds_under',
+    'fpts',
+    'e_fpts',
+    'date',
+]
+
+@dataclass
+class PropHistory:
+    """
+    Line + odds history of every individual prop throughout the day
+    - Fed once per scrape cycle with projections.project_prop_rows output (or Prop.to_dict() rows)
+    - Append-only: each cycle is one parquet part, nothing is ever rewritten
+    - Whole day kept in memory after first load for the query helpers
+    """
+    date_str: str = CONTEST_DATE_STR
+    writer: WriteBehind|None = None # part files queued on a WriteBehind instead of written inline
+
+    def __post_init__(self):
+        self.source = os.path.join(PROPS_DIR, self.date_str)
+        self._frames = [pd.read_parquet(part) for part in self._parts()]
+        self._history = None
+        self.runs = len(self._frames)
+
+    def _parts(self) -> list[str,...]:
+        if not os.path.isdir(self.source):
+            return []
+        return sorted(glob.glob(os.path.join(self.source, 'part-*.parquet')))
+
+    def append(self, prop_rows: pd.DataFrame|list[dict[str,float|str],...], scrape_time: str|None = None) -> None:
+        """
+        Files one scrape cycle worth of props as a single part
+        - prop_rows: Prop.to_dict() rows or projections.project_prop_rows output
+        """
+        if len(prop_rows) == 0:
+            return
+
+        os.makedirs(self.source, exist_ok=True)
+        part = (pd
+            .DataFrame(prop_rows)
+            .rename({'line': 'value', 'over_odds': 'odds_over', 'under_odds': 'odds_under'}, axis=1)
+            .assign(scrape_time=pd.Timestamp(scrape_time or datetime.datetime.now().isoformat(timespec='seconds')))
+            .reindex(HISTORY_COLUMNS, axis=1)
+        )
+        path = os.path.join(self.source, f'part-{self.runs:05d}.parquet')
+        if self.writer is None:
+            part.to_parquet(path, index=False)
+        else:
+            self.writer.write_parquet(part, [path], index=False)
+
+        self._frames.append(part)
+        self._history = None
+        self.runs += 1
+        return
+
+    def history(self, name: str|None = None, stat: str|None = None) -> pd.DataFrame:
+        """Long format: one row per prop per scrape, in scrape order"""
+        if self._history is None:
+            self._history = (pd
+                .concat(self._frames, ignore_index=True)
+                .sort_values('scrape_time', kind='stable')
+                .reset_index(drop=True)
+            ) if self._frames else pd.DataFrame(columns=HISTORY_COLUMNS)
+
+        df = self._history
+        if name:
+            df = df.loc[df.name == name]
+        if stat:
+            df = df.loc[df.stat == stat.lower()]
+
+        return df.reset_index(drop=True)
+
+    def line_movement(self, name: str|None = None, stat: str|None = None) -> pd.DataFrame:
+        """
+        Per (name, stat): opening vs current line and odds, number of line moves
+        """
+        df = self.history(name, stat)
+        by_prop = df.groupby(['name', 'stat'], sort=True)
+
+        return (pd
+            .DataFrame({
+                'line_open': by_prop.value.first(),
+                'line_now': by_prop.value.last(),
+                'odds_over_open': by_prop.odds_over.first(),
+                'odds_over_now': by_prop.odds_over.last(),
+                'true_odds_over_open': by_prop.true_odds_over.first(),
+                'true_odds_over_now': by_prop.true_odds_over.last(),
+                'line_moves': (by_prop.value.diff().fillna(0.0) != 0.0).groupby([df.name, df.stat]).sum(),
+                'odds_moves': (by_prop.odds_over.diff().fillna(0.0) != 0.0).groupby([df.name, df.stat]).sum(),
+                'first_seen': by_prop.scrape_time.first(),
+                'last_seen': by_prop.scrape_time.last(),
+            })
+            .assign(
+                line_movement=lambda df_: df_.line_now - df_.line_open,
+                true_odds_movement=lambda df_: df_.true_odds_over_now - df_.true_odds_over_open,
+            )
+        )
+
+    def odds_movement(self, name: str, stat: str) -> pd.DataFrame:
+        """Time series of line, odds and vig for a single prop, only rows where something changed"""
+        df = self.history(name, stat)[['scrape_time', 'value', 'odds_over', 'odds_under', 'true_odds_over', 'vig']]
+        changed = df[['value', 'odds_over', 'odds_under']].ne(df[['value', 'odds_over', 'odds_under']].shift()).any(axis=1)
+        return df.loc[changed].set_index('scrape_time')
+
+    def movers(self, n: int = 10, by: str = 'line_movement') -> pd.DataFrame:
+        """Props with biggest absolute move since open"""
+        df = self.line_movement()
+        return df.loc[df[by].abs().sort_values(ascending=False).index].head(n)
@@ -1,15 +1,23 @@
 import os
+import glob
 import datetime
+import threading
 import pandas as pd
 from dataclasses import dataclass
 
-import settings.custom
+from _writer import WriteBehind
+
+
+# Tracker files live next to this module, one directory of parquet parts per date
+TRACKER_DIR = os.path.join(os.path.dirname(os.path.abspath(__file__)), 'proptrackers')
 
 @dataclass
 class PropTracker:
     date_str: str = datetime.date.today().isoformat()
     init_time: str|None = None
     latest_time: str|None = None
+    label: str|None = None # e.g. 'fanduel-showdown' when several sites/modes are tracked the same day
+    writer: WriteBehind|None = None # part files queued on a WriteBehind instead of written inline
     # offset: int = -15 
 
     # For deegs computer being fast
@@ -27,81 +35,165 @@ class PropTracker:
             return 1
     
     def __post_init__(self):
+        """
+        - Append-only, long-format store: one parquet part per update with rows of (name, run, scrape_time, fpts, e_fpts)
+        - Summary (open/now/movements/just_moved) computed on read with vectorized groupby, never stored
+        - Files from older list-column format ({date}.parquet) are converted on first load
+        - History + summary kept in memory, disk only read here (or reload() after a crash)
+        - Lock around the cached history/summary: service threads read while constant_scrape updates
+        """
+        self._lock = threading.RLock()
+        self.source = os.path.join(TRACKER_DIR, self.date_str if not self.label else f'{self.date_str}-{self.label}')
+        self._migrate_legacy_file()
+        self.reload()
 
-        self.source = f'/home/deegs/devel/repos/nba-props-git/nba-props/src/prophandler/proptrackers/{self.date_str}.parquet'
-        if os.path.exists(self.source):
-            df = pd.read_parquet(self.source).set_index('name')
-            self.tracker = {name: list(props) for name, props in df.props.items()}
-            self.e_tracker = {name: list(e_props) for name, e_props in df.e_props.items()}
-            self.scrape_times = {name: list(scrape_times) for name, scrape_times in df.scrape_times.items()}
-            
-            self.init_time = df.init_time.iloc[0]
+        if self.runs:
+            self.init_time = self._frames[0].scrape_time.iloc[0]
             self.latest_time = self.current_time()
 
         else:
             print('Initializing tracker...')
-            self.tracker = {}
-            self.e_tracker = {}
-            self.scrape_times = {}
+            os.makedirs(self.source, exist_ok=True)
 
             self.init_time = self.current_time()
             self.latest_time = self.current_time()
 
-    def update(self, fpts_df: pd.DataFrame) -> None:
+    def reload(self) -> None:
+        """(Re)build in-memory state from part files on disk"""
+        frames = [pd.read_parquet(part) for part in self._parts()]
+        with self._lock:
+            self._frames = frames
+            self._history = None
+            self._summary = None
+            self.runs = max((int(frame.run.max()) + 1 for frame in self._frames if not frame.empty), default=0)
+        return
 
-        for name, row in fpts_df.iterrows():
-            self.tracker[name] = self.tracker.get(name, []) + [row.fpts]
-            self.e_tracker[name] = self.e_tracker.get(name, []) + [row.e_fpts]
-            self.scrape_times[name] = self.scrape_times.get(name, []) + [self.latest_time]
+    def _parts(self) -> list[str,...]:
+        if not os.path.isdir(self.source):
+            return []
+        return sorted(glob.glob(os.path.join(self.source, 'part-*.parquet')))
 
-        # Ensure trackers line up
-        self.tracker = dict(sorted(self.tracker.items(), key=lambda item: item[0]))
-        self.e_tracker = dict(sorted(self.e_tracker.items(), key=lambda item: item[0]))
-        self.scrape_times = dict(sorted(self.scrape_times.items(), key=lambda item: item[0]))
-        
-        # Constructed dataframe this way so list of props all in a single column, whereas if did DataFrame(data={...}) it would automatically expand the list
-        (pd
-            .DataFrame()
+    def _migrate_legacy_file(self) -> None:
+        """Explode old one-row-per-player list columns into long format part file"""
+        legacy_source = f'{self.source}.parquet'
+        if not os.path.exists(legacy_source) or self._parts():
+            return
+
+        df = pd.read_parquet(legacy_source)
+        os.makedirs(self.source, exist_ok=True)
+        (df[['name', 'props', 'e_props', 'scrape_times']]
+            .explode(['props', 'e_props', 'scrape_times'])
+            .rename({'props': 'fpts', 'e_props': 'e_fpts', 'scrape_times': 'scrape_time'}, axis=1)
             .assign(
-                name=self.tracker.keys(),
-                props=pd.Series([list(val) for val in self.tracker.values()]),
-                e_props=pd.Series([list(val) for val in self.e_tracker.values()]),
-                scrape_times=pd.Series([list(val) for val in self.scrape_times.values()]),
-                init_time=self.init_time,
-                latest_time=self.latest_time,
-                props_open=lambda df_: df_.props.map(lambda props_: props_[0]),
-                e_props_open=lambda df_: df_.e_props.map(lambda e_props_: e_props_[0]),
-                props_now=lambda df_: df_.props.map(lambda props_: props_[-1]),
-                e_props_now=lambda df_: df_.e_props.map(lambda e_props_: e_props_[-1]),
-                movements=lambda df_: df_.props.map(lambda props: sum(1 for i, prop in enumerate(props) if all([i > 0, prop != props[i-1]]))),
-                e_movements=lambda df_: df_.e_props.map(lambda e_props: sum(1 for i, e_prop in enumerate(e_props) if all([i > 0, e_prop != e_props[i-1]]))),
-                just_moved=lambda df_: df_.props.apply(self._just_moved)
+                run=lambda df_: df_.groupby('name').cumcount(),
+                fpts=lambda df_: df_.fpts.astype('float'),
+                e_fpts=lambda df_: df_.e_fpts.astype('float'),
+            )
+            .sort_values('run', kind='stable')
+            [['name', 'run', 'scrape_time', 'fpts', 'e_fpts']]
+            .to_parquet(os.path.join(self.source, 'part-00000.parquet'), index=False)
+        )
+        os.rename(legacy_source, f'{legacy_source}.migrated')
+        return
+
+    def update(self, fpts_df: pd.DataFrame) -> None:
+        """Appends one part file with this scrape's values, O(players) regardless of how many runs so far"""
+        os.makedirs(self.source, exist_ok=True)
+
+        with self._lock:
+            self.latest_time = self.current_time()
+            part = (fpts_df[['fpts', 'e_fpts']]
+                .rename_axis('name')
+                .reset_index()
+                .assign(run=self.runs, scrape_time=self.latest_time)
+                [['name', 'run', 'scrape_time', 'fpts', 'e_fpts']]
             )
+            path = os.path.join(self.source, f'part-{self.runs:05d}.parquet')
+            if self.writer is None:
+                part.to_parquet(path, index=False)
+            else:
+                self.writer.write_parquet(part, [path], index=False)
+
+            self._frames.append(part)
+            self._history = None
+            self._summary = None
+            self.runs += 1
+
+    def history(self, name: str|None = None) -> pd.DataFrame:
+        """Long format history of every scrape, in scrape order"""
+        with self._lock:
+            if self._history is None:
+                self._history = (pd
+                    .concat(self._frames, ignore_index=True)
+                    .sort_values('run', kind='stable')
+                    .reset_index(drop=True)
+                ) if self._frames else pd.DataFrame(columns=['name', 'run', 'scrape_time', 'fpts', 'e_fpts'])
+            history = self._history
+
+        return history.loc[history.name == name].reset_index(drop=True) if name else history
+
+    @staticmethod
+    def _summarize(history: pd.DataFrame) -> pd.DataFrame:
+        """
+        - open/now: first/last value per player
+        - movements: number of scrapes where value differs from previous scrape
+        - just_moved: moved in either of last two scrapes, or fewer than 3 scrapes so far (same as _just_moved)
+        """
+        by_name = history.groupby('name', sort=True)
+        moved = by_name.fpts.diff().fillna(0.0) != 0.0
+        e_moved = by_name.e_fpts.diff().fillna(0.0) != 0.0
+        recent = by_name.cumcount(ascending=False) < 2
+
+        return (pd
+            .DataFrame({
+                'props_open': by_name.fpts.first(),
+                'e_props_open': by_name.e_fpts.first(),
+                'props_now': by_name.fpts.last(),
+                'e_props_now': by_name.e_fpts.last(),
+                'movements': moved.groupby(history.name).sum(),
+                'e_movements': e_moved.groupby(history.name).sum(),
+                'just_moved': ((moved & recent).groupby(history.name).any() | (by_name.size() < 3)).astype('int'),
+                'first_time': by_name.scrape_time.first(),
+                'latest_time': by_name.scrape_time.last(),
+            })
+            .rename_axis('name')
             .sort_values('e_props_now', ascending=False)
-            .reset_index(drop=True)
-            .to_parquet(self.source)
         )
 
     def data(self) -> pd.DataFrame:
-        return pd.read_parquet(self.source).set_index('name')
+        with self._lock:
+            if self._summary is None:
+                self._summary = self._summarize(self.history()).assign(init_time=self.init_time)
+            return self._summary
+
+    def open_values(self) -> pd.DataFrame:
+        """Opening fpts/e_fpts for each player -> props_open, e_props_open"""
+        return self.data()[['props_open', 'e_props_open']]
+
+    def movement(self) -> pd.DataFrame:
+        """Net move since open plus move counts for each player"""
+        return (self
+            .data()
+            [['props_open', 'props_now', 'e_props_open', 'e_props_now', 'movements', 'e_movements', 'just_moved']]
+            .assign(
+                movement=lambda df_: df_.props_now - df_.props_open,
+                e_movement=lambda df_: df_.e_props_now - df_.e_props_open,
+            )
+        )
 
 
     def visualize(self, name: str, value: str = 'e_props') -> pd.DataFrame:
-        df = self.data().loc[name]
+        df_viz = (self
+            .history(name)
+            .rename({'fpts': 'props', 'e_fpts': 'e_props', 'scrape_time': 'scrape_times'}, axis=1)
+        )
     
-        n_props = len(list(df.props))
-        
-        df_viz = pd.DataFrame(data = {
-            'name': [name]*n_props,
-            'props': list(df.props),
-            'e_props': list(df.e_props),
-            'scrape_times': list(df.scrape_times)
-        })
+        n_props = len(df_viz)
     
         step = (max(df_viz[value]) - min(df_viz[value])) / 10
     
         return df_viz.groupby('name')[value].plot.line(
-            title=f'{value} movement for {name} since {df.init_time}',
+            title=f'{value} movement for {name} since {self.init_time}',
             figsize=(12,6),
             xticks=[i for i, time in enumerate(df_viz.scrape_times) if not i % 10],
             yticks=[min(df_viz[value]) + n*step for n in range(-1, n_props+10) if (min(df_viz[value]) + n*step) <= max(df_viz[value])+step]
@@ -109,4 +201,4 @@ class PropTracker:
         
         
     def __bool__(self) -> bool:
-        return len(self.tracker) > 0
\ No newline at end of file
+        return self.runs > 0
\ No newline at end of file
@@ -0,0 +1,72 @@
+import os
+import pandas as pd
+from dataclasses import dataclass
+
+from designs import DATA_DIR, CONTEST_DATE_STR
+from projections import RAW_COLUMNS
+from _writer import WriteBehind
+from _utils import _atomic_write, _parquet_bytes
+
+# Latest raw prop table per date: data/rawprops/{date}.parquet
+RAW_PROPS_DIR = os.path.join(DATA_DIR, 'rawprops')
+
+SNAPSHOT_COLUMNS = RAW_COLUMNS + ['scrape_time']
+
+@dataclass
+class RawPropSnapshot:
+    """
+    Site independent raw props (lines + odds) for the whole slate as of the last scrape
+    - Rewritten in place every scrape cycle, readers never see a partial file
+    - Enough to rebuild any site/mode projection offline (PropHandler.rescore)
+    - scrape_time: when that player's page was last actually fetched (frozen/carried players keep theirs)
+    - writer: snapshot queued on a WriteBehind instead of written inline, load() waits for it first
+    """
+    date_str: str = CONTEST_DATE_STR
+    writer: WriteBehind|None = None
+
+    def __post_init__(self):
+        self.path = os.path.join(RAW_PROPS_DIR, f'{self.date_str}.parquet')
+
+    def __bool__(self) -> bool:
+        return os.path.exists(self.path)
+
+    def save(self, raw: pd.DataFrame) -> None:
+        os.makedirs(RAW_PROPS_DIR, exist_ok=True)
+
+        snapshot = (raw
+            .reindex(SNAPSHOT_COLUMNS, axis=1)
+            .astype({
+                'name': 'category',
+                'team': 'category',
+                'date': 'category',
+                'stat': 'category',
+                'line': 'float32',
+                'over_odds': 'int16',
+                'under_odds': 'int16',
+            })
+        )
+        if self.writer is None:
+            _atomic_write(self.path, _parquet_bytes(snapshot, index=False))
+        else:
+            self.writer.write_parquet(snapshot, [self.path], index=False)
+        return
+
+    def load(self) -> pd.DataFrame:
+        """Back to the dtypes scrape_slate_raw produces"""
+        if self.writer is not None:
+            self.writer.flush()
+        if not self:
+            return pd.DataFrame(columns=SNAPSHOT_COLUMNS)
+
+        return (pd
+            .read_parquet(self.path)
+            .astype({
+                'name': 'str',
+                'team': 'str',
+                'date': 'str',
+                'stat': 'str',
+                'line': 'float64',
+                'over_odds': 'int64',
+                'under_odds': 'int64',
+            })
+        )
@@ -0,0 +1,134 @@
+import time
+import heapq
+import itertools
+import numpy as np
+import pandas as pd
+from dataclasses import dataclass, field
+
+# DK/FD Game Info times are Eastern
+GAME_TZ = 'America/New_York'
+
+@dataclass
+class ScrapeScheduler:
+    """
+    Decides which players get refetched on each constant_scrape cycle
+    - Priority queue ordered by when each player is next due, most overdue first
+    - Refresh interval resets to min_interval when a player just moved (PropTracker just_moved)
+    - Interval grows by backoff every refresh that comes back unchanged, up to max_interval
+    - High salaries and games close to tip get shorter intervals
+    - requests_per_minute caps fetches (token bucket, up to one minute of burst)
+    """
+    requests_per_minute: float = 60.0
+    base_interval: float = 120.0
+    min_interval: float = 30.0
+    max_interval: float = 900.0
+    backoff: float = 1.5
+    # Minutes before tip where refreshes start ramping up
+    tip_window: float = 90.0
+    _queue: list[tuple[float,int,str],...] = field(default_factory=list, repr=False)
+
+    def __post_init__(self):
+        self._due = {}
+        self._interval = {}
+        self._weight = pd.Series(dtype='float64')
+        self._order = itertools.count()
+        self._tokens = float(self.requests_per_minute)
+        self._refilled = time.monotonic()
+
+    def __len__(self) -> int:
+        return len(self._due)
+
+    def _push(self, name: str, due: float) -> None:
+        # Old entries for name are left in the heap and skipped when popped
+        self._due[name] = due
+        heapq.heappush(self._queue, (due, next(self._order), name))
+        return
+
+    @staticmethod
+    def _tip_factor(tipoffs: pd.Series, tip_window: float) -> pd.Series:
+        minutes_to_tip = (tipoffs - pd.Timestamp.now(tz=GAME_TZ)).dt.total_seconds() / 60
+        return (minutes_to_tip / tip_window).clip(0.25, 1.0).fillna(1.0)
+
+    def sync(self, slate: pd.DataFrame) -> None:
+        """
+        Keeps queue in step with the contest file
+        - slate: indexed by name with salary + tipoff columns
+        - New players are due immediately, players no longer on the slate are dropped
+        """
+        salary = slate.salary.astype('float64')
+        self._weight = (
+            (salary.median() / salary).clip(0.5, 2.0)
+            * self._tip_factor(slate.tipoff, self.tip_window)
+        ) if not slate.empty else pd.Series(dtype='float64')
+
+        now = time.monotonic()
+        for name in slate.index.difference(list(self._due)):
+            self._interval[name] = self.base_interval
+            self._push(name, now)
+
+        for name in set(self._due).difference(slate.index):
+            del self._due[name]
+            del self._interval[name]
+
+        return
+
+    def expedite(self, names: list[str,...]) -> None:
+        """
+        Puts names at the front of the queue (returning from injury, ...), added if not queued yet
+        - Still fetched through due(), so they count against the request budget like everyone else
+        """
+        for name in names:
+            self._interval.setdefault(name, self.base_interval)
+            self._push(name, 0.0)
+        return
+
+    def due(self) -> list[str,...]:
+        """Players to fetch this cycle, as many as the request budget allows"""
+        now = time.monotonic()
+        self._tokens = min(
+            float(self.requests_per_minute),
+            self._tokens + self.requests_per_minute * (now - self._refilled) / 60,
+        )
+        self._refilled = now
+
+        names = []
+        while self._queue and self._queue[0][0] <= now and len(names) < int(self._tokens):
+            due, _, name = heapq.heappop(self._queue)
+            if self._due.get(name) != due:
+                continue
+            names.append(name)
+            # Provisional slot so a failed cycle doesn't drop the player from the queue
+            self._push(name, now + self._interval[name])
+
+        self._tokens -= len(names)
+        return names
+
+    def reschedule(self, names: list[str,...], moved: pd.Series) -> None:
+        """
+        Sets next due time for players just fetched
+        - moved: PropTracker data().just_moved (players missing count as unchanged)
+        """
+        names = [name for name in names if name in self._due]
+        if not names:
+            return
+
+        moved = moved.reindex(names).fillna(0).astype('bool').to_numpy()
+        interval = np.array([self._interval[name] for name in names])
+        interval = np.where(moved, self.min_interval, np.minimum(interval * self.backoff, self.max_interval))
+        wait = np.clip(interval * self._weight.reindex(names).fillna(1.0).to_numpy(), self.min_interval, self.max_interval)
+
+        now = time.monotonic()
+        for name, interval_, wait_ in zip(names, interval, wait):
+            self._interval[name] = float(interval_)
+            self._push(name, now + float(wait_))
+
+        return
+
+    def summary(self) -> dict[str, float]:
+        now = time.monotonic()
+        return {
+            'players': len(self._due),
+            'due_now': sum(1 for due in self._due.values() if due <= now),
+            'median_interval': float(np.median(list(self._interval.values()))) if self._interval else 0.0,
+            'tokens': round(self._tokens, 2),
+        }
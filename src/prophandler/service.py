@@ -0,0 +1,201 @@
+import json
+import math
+import hashlib
+import threading
+import collections
+import http.server
+import pandas as pd
+from dataclasses import dataclass, field
+from urllib.parse import urlparse, parse_qs, unquote
+
+from .prophandler import PropHandler
+from .multisite import MultiSiteHandler
+from _metrics import METRICS
+from _utils import _output_msgs
+
+# Number of past versions /changes can diff against before telling clients to resync
+CHANGES_KEPT = 200
+# Longest a /changes long-poll may hold a server thread, longer timeouts are clamped to it
+MAX_CHANGES_TIMEOUT = 60.0
+
+
+def _to_records(df: pd.DataFrame) -> list[dict]:
+    return json.loads(df.reset_index().to_json(orient='records', date_format='iso'))
+
+
+@dataclass
+class ProjectionService:
+    """
+    Keeps the current slate + PropTracker in memory and serves them over local HTTP/JSON
+    - Runs PropHandler (or MultiSiteHandler).constant_scrape on a background thread, every run is published as a new version
+    - GET /slate, /player/{name}, /movers?n=&by=, /tracker?name=, /health, /metrics
+    - Responses carry ETag = version, If-None-Match gets 304 when nothing moved
+    - GET /changes?since={version}&timeout={s} blocks until a newer version exists (at most MAX_CHANGES_TIMEOUT),
+        returns names whose fpts/e_fpts/props changed ({'resync': true} if since is too old)
+    - Malformed query parameters get a 400
+    """
+    handler: PropHandler|MultiSiteHandler
+    host: str = '127.0.0.1'
+    port: int = 8765
+    max_runs: int = 10_000
+    scrape_kwargs: dict = field(default_factory=dict)
+
+    def __post_init__(self):
+        self.version = 0
+        self.slate = None
+        # (version, names changed in that version)
+        self._changes = collections.deque(maxlen=CHANGES_KEPT)
+        self._updated = threading.Condition()
+        self._stop = threading.Event()
+        self._server = None
+        self._scraper_thread = None
+
+    def publish(self, slate: pd.DataFrame) -> int:
+        """New slate from the handler -> bump version and wake any /changes waiters"""
+        columns = ['fpts', 'e_fpts', 'props']
+        if self.slate is None:
+            changed = list(slate.index)
+        else:
+            previous = self.slate[columns].reindex(slate.index)
+            moved = (previous != slate[columns]).any(axis=1)
+            changed = list(slate.index[moved]) + list(self.slate.index.difference(slate.index))
+
+        with self._updated:
+            self.slate = slate
+            self.version += 1
+            self._changes.append((self.version, changed))
+            self._updated.notify_all()
+
+        return self.version
+
+    def changes(self, since: int, timeout: float = 30.0) -> dict:
+        with self._updated:
+            self._updated.wait_for(lambda: self.version > since or self._stop.is_set(), timeout=timeout)
+            version, changes = self.version, list(self._changes)
+
+        if version <= since:
+            return {'version': version, 'changed': []}
+        if not changes or changes[0][0] > since + 1:
+            return {'version': version, 'resync': True, 'changed': []}
+
+        return {
+            'version': version,
+            'changed': sorted(set(name for version_, names in changes if version_ > since for name in names)),
+        }
+
+    @staticmethod
+    def movers(slate: pd.DataFrame, n: int = 10, by: str = 'movement') -> pd.DataFrame:
+        return slate.loc[slate[by].abs().sort_values(ascending=False).index].head(n)
+
+    def route(self, path: str, query: dict[str, list[str,...]]) -> tuple[int, object]:
+        """(status, json-able body) for a GET, kept apart from the socket handling"""
+        param = lambda key, default: query.get(key, [default])[0]
+        # One frame for the whole request even if a publish lands mid-way
+        slate = self.slate
+
+        if path == '/health':
+            return 200, {'version': self.version, 'players': 0 if slate is None else len(slate)}
+        if path == '/metrics':
+            return 200, METRICS.summary()
+        if path == '/changes':
+            try:
+                since, timeout = int(param('since', 0)), float(param('timeout', 30.0))
+            except ValueError:
+                return 400, {'error': f'since must be an int and timeout a number, got {param("since", 0)} and {param("timeout", 30.0)}'}
+            if not math.isfinite(timeout):
+                return 400, {'error': f'timeout must be a number of seconds, got {timeout}'}
+            return 200, self.changes(since, min(max(timeout, 0.0), MAX_CHANGES_TIMEOUT))
+        if slate is None:
+            return 503, {'error': 'No slate yet, first scrape still running'}
+
+        if path == '/slate':
+            return 200, _to_records(slate)
+        if path == '/movers':
+            by = param('by', 'movement')
+            if by not in ('movement', 'e_movement'):
+                return 400, {'error': f'by must be movement or e_movement, got {by}'}
+            n = param('n', '10')
+            if not n.isdigit():
+                return 400, {'error': f'n must be a non-negative int, got {n}'}
+            return 200, _to_records(self.movers(slate, int(n), by))
+        if path == '/tracker':
+            return 200, _to_records(self.handler.tracker.history(param('name', None)))
+        if path.startswith('/player/'):
+            name = unquote(path[len('/player/'):])
+            if name not in slate.index:
+                return 404, {'error': f'{name} not on slate'}
+            return 200, {
+                **_to_records(slate.loc[[name]])[0],
+                'history': _to_records(self.handler.tracker.history(name)),
+            }
+
+        return 404, {'error': f'Unknown path {path}'}
+
+    def _request_handler(self) -> type[http.server.BaseHTTPRequestHandler]:
+        service = self
+
+        class ServiceHandler(http.server.BaseHTTPRequestHandler):
+            protocol_version = 'HTTP/1.1'
+
+            def do_GET(self):
+                url = urlparse(self.path)
+                # Tag taken before routing so a publish mid-request can only make the tag stale, never wrong
+                etag = f'"{service.version}-{hashlib.sha1(self.path.encode()).hexdigest()[:8]}"'
+                if url.path != '/changes' and self.headers.get('If-None-Match') == etag:
+                    self.send_response(304)
+                    self.send_header('ETag', etag)
+                    self.end_headers()
+                    return
+
+                status, body = service.route(url.path, parse_qs(url.query))
+                payload = json.dumps(body).encode()
+                self.send_response(status)
+                self.send_header('Content-Type', 'application/json')
+                self.send_header('Content-Length', str(len(payload)))
+                if status == 200 and url.path != '/changes':
+                    self.send_header('ETag', etag)
+                self.end_headers()
+                self.wfile.write(payload)
+
+            def log_message(self, *args):
+                return
+
+        return ServiceHandler
+
+    def start(self, scrape: bool = True) -> None:
+        """Binds the server and (optionally) starts scraping, both on daemon threads"""
+        self._server = http.server.ThreadingHTTPServer((self.host, self.port), self._request_handler())
+        self._server.daemon_threads = True
+        self.port = self._server.server_port
+        threading.Thread(target=self._server.serve_forever, daemon=True).start()
+
+        if scrape:
+            self._scraper_thread = threading.Thread(
+                target=self.handler.constant_scrape,
+                kwargs={'max_runs': self.max_runs, 'on_update': self.publish, 'stop': self._stop, **self.scrape_kwargs},
+                daemon=True,
+            )
+            self._scraper_thread.start()
+
+        _output_msgs([f'Serving projections on http://{self.host}:{self.port}'])
+        return
+
+    def stop(self) -> None:
+        self._stop.set()
+        with self._updated:
+            self._updated.notify_all()
+        if self._server:
+            self._server.shutdown()
+            self._server.server_close()
+        return
+
+    def serve_forever(self) -> None:
+        self.start()
+        try:
+            while self._scraper_thread.is_alive():
+                self._scraper_thread.join(timeout=1.0)
+        except KeyboardInterrupt:
+            pass
+        finally:
+            self.stop()
+        return
@@ -0,0 +1,134 @@
+import os
+import glob
+import json
+import time
+import datetime
+import threading
+from dataclasses import dataclass, field
+from typing import Callable
+
+from _utils import _atomic_write, _output_msgs
+
+
+def diff_directories(old: dict[str, dict[str, str]], new: dict[str, dict[str, str]]) -> dict[str, list[tuple[str,...]]]:
+    """
+    Compares two {team: {name: url}} maps
+    - traded: (name, old team, new team)
+    - new: (name, team) on a team now, not listed anywhere before
+    - removed: (name, team) not listed anywhere anymore
+    - moved: (name, team) same team, url changed
+    """
+    old_teams = {name: team for team, players in old.items() for name in players}
+    new_teams = {name: team for team, players in new.items() for name in players}
+
+    return {
+        'traded': sorted((name, old_teams[name], team) for name, team in new_teams.items() if name in old_teams and old_teams[name] != team),
+        'new': sorted((name, team) for name, team in new_teams.items() if name not in old_teams),
+        'removed': sorted((name, team) for name, team in old_teams.items() if name not in new_teams),
+        'moved': sorted(
+            (name, team) for name, team in new_teams.items()
+            if old_teams.get(name) == team and old[team][name] != new[team][name]
+        ),
+    }
+
+
+@dataclass
+class DirectoryCache:
+    """
+    On-disk copy of the scoresandodds players index, one file per date: {cache_dir}/{date}.json
+    - load() is instant whenever today's file exists, fetching only when there is none
+    - Files older than ttl are served as-is while a background thread refetches
+    - No file for today -> most recent earlier one kept if the fetch fails
+    - Every refetch is diffed against what it replaces, trades/new players are logged
+    """
+    fetch: Callable[[], dict[str, dict[str, str]]]
+    cache_dir: str
+    ttl: float = 6 * 60 * 60
+    date_str: str = field(default_factory=lambda: datetime.date.today().isoformat())
+    directory: dict[str, dict[str, str]] = field(default_factory=dict, repr=False)
+    fetched_at: float = 0.0
+
+    def __post_init__(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+        self.path = os.path.join(self.cache_dir, f'{self.date_str}.json')
+        self._lock = threading.Lock()
+        self._thread = None
+
+    @property
+    def age(self) -> float:
+        return time.time() - self.fetched_at
+
+    @property
+    def stale(self) -> bool:
+        return self.age > self.ttl
+
+    def _read(self, path: str) -> tuple[float, dict[str, dict[str, str]]]:
+        with open(path) as f:
+            cached = json.load(f)
+        return cached['fetched_at'], cached['directory']
+
+    def _previous(self) -> dict[str, dict[str, str]]:
+        """Most recent earlier date on disk, diffed against and kept if today's fetch fails"""
+        paths = sorted(path for path in glob.glob(os.path.join(self.cache_dir, '*.json')) if path < self.path)
+        return self._read(paths[-1])[1] if paths else {}
+
+    def _swap(self, directory: dict[str, dict[str, str]]) -> None:
+        # Team by team in place so anyone holding self.directory sees the new links, never an empty dict
+        for team in set(self.directory).difference(directory):
+            del self.directory[team]
+        for team, players in directory.items():
+            self.directory[team] = players
+        return
+
+    def load(self) -> dict[str, dict[str, str]]:
+        if os.path.exists(self.path):
+            self.fetched_at, directory = self._read(self.path)
+            self._swap(directory)
+            self.maybe_refresh()
+        else:
+            self._swap(self._previous())
+            try:
+                self.refresh()
+            except Exception as e:
+                # Nothing to fall back on -> the caller has to know
+                if not self.directory:
+                    raise
+                _output_msgs([f'Directory refresh failed, keeping previous copy: {e}'], warning=True)
+
+        return self.directory
+
+    def refresh(self) -> dict[str, list[tuple[str,...]]]:
+        """Refetch, log differences, save and swap in"""
+        with self._lock:
+            directory = self.fetch()
+            changes = diff_directories(self.directory, directory) if self.directory else {}
+
+            self.fetched_at = time.time()
+            _atomic_write(self.path, json.dumps({'fetched_at': self.fetched_at, 'directory': directory}).encode())
+            self._swap(directory)
+
+        msgs = [
+            *[f'Traded: {name} {old_team} -> {team}' for name, old_team, team in changes.get('traded', [])],
+            *[f'New player: {name} ({team})' for name, team in changes.get('new', [])],
+            *[f'No longer listed: {name} ({team})' for name, team in changes.get('removed', [])],
+        ]
+        if msgs:
+            _output_msgs(msgs)
+
+        return changes
+
+    def _refresh_in_background(self) -> None:
+        try:
+            self.refresh()
+        except Exception as e:
+            _output_msgs([f'Directory refresh failed, keeping cached copy: {e}'], warning=True)
+        return
+
+    def maybe_refresh(self) -> bool:
+        """Kick off a background refetch if stale and none running, returns whether one was started"""
+        if not self.stale or (self._thread and self._thread.is_alive()):
+            return False
+
+        self._thread = threading.Thread(target=self._refresh_in_background, daemon=True)
+        self._thread.start()
+        return True
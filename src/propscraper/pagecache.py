@@ -0,0 +1,105 @@
+import os
+import json
+import hashlib
+import threading
+from dataclasses import dataclass, field
+
+from _utils import _atomic_write
+
+
+@dataclass
+class PageCache:
+    """
+    On-disk HTTP cache for scoresandodds pages, keyed by URL
+    - Stores ETag / Last-Modified validators so refetches can be conditional (304 = nothing sent back)
+    - Stores sha1 of body so PropScraper can skip re-parsing pages whose content didn't move
+    - One metadata + one body file per URL, so concurrent scrapes never rewrite a shared index
+    """
+    cache_dir: str
+    not_modified: int = 0
+    unchanged: int = 0
+    changed: int = 0
+    _meta: dict[str, dict[str, str]] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def __post_init__(self):
+        os.makedirs(self.cache_dir, exist_ok=True)
+
+    @staticmethod
+    def _key(url: str) -> str:
+        return hashlib.sha1(url.encode()).hexdigest()
+
+    def _paths(self, url: str) -> tuple[str, str]:
+        key = self._key(url)
+        return os.path.join(self.cache_dir, f'{key}.json'), os.path.join(self.cache_dir, f'{key}.html')
+
+    def lookup(self, url: str) -> dict[str, str]|None:
+        """Cached metadata for url: {'etag', 'last_modified', 'body_hash'}"""
+        if url in self._meta:
+            return self._meta[url]
+
+        meta_path, body_path = self._paths(url)
+        if not (os.path.exists(meta_path) and os.path.exists(body_path)):
+            return None
+
+        with open(meta_path) as f:
+            meta = json.load(f)
+
+        self._meta[url] = meta
+        return meta
+
+    def conditional_headers(self, url: str) -> dict[str, str]:
+        meta = self.lookup(url)
+        if not meta:
+            return {}
+
+        headers = {}
+        if meta.get('etag'):
+            headers['If-None-Match'] = meta['etag']
+        if meta.get('last_modified'):
+            headers['If-Modified-Since'] = meta['last_modified']
+
+        return headers
+
+    def body(self, url: str) -> bytes:
+        with open(self._paths(url)[1], 'rb') as f:
+            return f.read()
+
+    def hit(self, url: str) -> tuple[bytes, str]:
+        """Server answered 304 -> serve cached body"""
+        with self._lock:
+            self.not_modified += 1
+        return self.body(url), self.lookup(url)['body_hash']
+
+    def store(self, url: str, content: bytes, headers: dict[str, str]) -> str:
+        """
+        Save fresh 200 response, returns body hash
+        - Body only rewritten if content actually changed
+        """
+        body_hash = hashlib.sha1(content).hexdigest()
+        previous = self.lookup(url)
+        meta = {
+            'url': url,
+            'etag': headers.get('ETag', ''),
+            'last_modified': headers.get('Last-Modified', ''),
+            'body_hash': body_hash,
+        }
+        meta_path, body_path = self._paths(url)
+
+        content_changed = not previous or previous.get('body_hash') != body_hash
+        if content_changed:
+            _atomic_write(body_path, content)
+        if meta != previous:
+            _atomic_write(meta_path, json.dumps(meta).encode())
+
+        with self._lock:
+            self._meta[url] = meta
+            if content_changed:
+                self.changed += 1
+            else:
+                self.unchanged += 1
+
+        return body_hash
+
+    def summary(self) -> dict[str, int]:
+        return {'not_modified': self.not_modified, 'unchanged': self.unchanged, 'changed': self.changed}
@@ -0,0 +1,96 @@
+from dataclasses import dataclass, field
+
+try:
+    import lxml.html
+except ImportError:
+    lxml = None
+
+from bs4 import BeautifulSoup, SoupStrainer
+
+# Only first N spans ever looked at when finding the date header(s)
+MAX_SPANS = 200
+
+
+@dataclass(slots=True)
+class PropPage:
+    """
+    Everything scrape_raw_props needs from a player page
+    - spans: text of first MAX_SPANS <span> tags in document order (date headers live here)
+    - tables: one entry per <table class="sticky">, each a list of rows of stripped <td> texts
+        - None if the table has no <tbody> (treated as failed scrape)
+        - rows without any <td> are dropped
+    """
+    spans: list[str,...] = field(default_factory=list)
+    tables: list[list[list[str,...]]|None] = field(default_factory=list)
+
+
+def _is_sticky(class_attr: str|list[str,...]|None) -> bool:
+    if not class_attr:
+        return False
+    if isinstance(class_attr, str):
+        class_attr = class_attr.split()
+    return 'sticky' in class_attr
+
+
+def _parse_lxml(content: bytes) -> PropPage:
+    page = PropPage()
+    root = lxml.html.fromstring(content)
+
+    # Single walk over the tree picking up both spans and tables in document order
+    for el in root.iter('span', 'table'):
+        if el.tag == 'span':
+            if len(page.spans) < MAX_SPANS:
+                page.spans.append(el.text_content())
+        elif _is_sticky(el.get('class')):
+            tbody = next(el.iter('tbody'), None)
+            page.tables.append(None if tbody is None else [
+                [td.text_content().strip() for td in cells]
+                for cells in (list(tr.iter('td')) for tr in tbody.iter('tr'))
+                if cells
+            ])
+
+    return page
+
+
+def _parse_html_parser(content: bytes) -> PropPage:
+    page = PropPage()
+    # Strainer means only span/table subtrees are ever built
+    soup = BeautifulSoup(content, 'html.parser', parse_only=SoupStrainer(['span', 'table']))
+
+    for tag in soup.find_all(['span', 'table']):
+        if tag.name == 'span':
+            if len(page.spans) < MAX_SPANS:
+                page.spans.append(tag.get_text())
+        elif _is_sticky(tag.get('class')):
+            tbody = tag.find('tbody')
+            page.tables.append(None if tbody is None else [
+                [td.get_text().strip() for td in cells]
+                for cells in (tr.find_all('td') for tr in tbody.find_all('tr'))
+                if cells
+            ])
+
+    return page
+
+
+# Backends that can actually run here, lxml only when it is installed
+PARSERS = {
+    **({'lxml': _parse_lxml} if lxml is not None else {}),
+    'html.parser': _parse_html_parser,
+}
+PARSER_BACKENDS = tuple(PARSERS)
+PARSER_BACKEND = PARSER_BACKENDS[0]
+
+
+def parse_prop_page(content: bytes, backend: str|None = None) -> PropPage:
+    """
+    Parses a scoresandodds player page in one pass
+    - Uses lxml when installed, falls back to bs4 + html.parser
+    - backend: force one of PARSER_BACKENDS, ValueError for anything unknown or not installed
+    """
+    backend = backend or PARSER_BACKEND
+    if backend not in PARSERS:
+        raise ValueError(f'parser backend {backend!r} not available (available: {", ".join(PARSER_BACKENDS)})')
+    if not content:
+        return PropPage()
+
+    return PARSERS[backend](content)
@@ -1,13 +1,23 @@
+import os
+import hashlib
 import requests
 import datetime
-import random
 import pandas as pd
 from bs4 import BeautifulSoup
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass, field
 
-from designs import MoneyLine, Prop, Player
+from designs import MoneyLine, DATA_DIR
 from .conversions import TEAM_INITIALS_MAP
-from _utils import _clean_name, _clean_team
+from .throttle import HostThrottle
+from .session import ScraperSession
+from .pagecache import PageCache
+from .directory import DirectoryCache
+from .parser import parse_prop_page, PropPage
+from projections import RAW_COLUMNS
+from _utils import _clean_name
+from _errors import ScrapeRequestError
+from _metrics import METRICS
 
 @dataclass
 class PropScraper:
@@ -17,11 +27,36 @@ class PropScraper:
     team_date_ranges: dict[str, range] = field(default_factory=dict)
     tomorrow: bool = False
     yesterday: bool = False
+    max_in_flight: int = 8 # Max player pages being fetched/parsed at once in scrape_slate_raw, 1 = sequential
+    host_delay: float = 0.1 # Min seconds between request starts to the same host
+    session: ScraperSession|None = None # Shared pooled client, built from max_in_flight/host_delay if not given
+    use_cache: bool = True # Conditional GETs against on-disk page cache, skip parsing pages that didn't change
+    page_cache: PageCache|None = None
+    directory_cache: DirectoryCache|None = None # Players index kept on disk per date, refetched in background once older than ttl
+    directory_ttl: float = 6 * 60 * 60
 
     def __post_init__(self, **kwargs):
         """
         Class to scrape individual player props and convert to FPTS
         """
+        if not self.session:
+            self.session = ScraperSession(
+                pool_size=max(self.max_in_flight, 1),
+                throttle=HostThrottle(delay=self.host_delay),
+            )
+
+        if self.use_cache and not self.page_cache:
+            self.page_cache = PageCache(os.path.join(DATA_DIR, 'pagecache'))
+
+        if self.use_cache and not self.directory_cache:
+            self.directory_cache = DirectoryCache(
+                fetch=self.create_webpage_directory,
+                cache_dir=os.path.join(DATA_DIR, 'directory'),
+                ttl=self.directory_ttl,
+            )
+
+        # {url: (body_hash, raw_rows)} -> raw prop rows reused as long as page content hash is unchanged
+        self._raw_parsed = {}
         
         if self.tomorrow:
             self.scoresandodds_date_str = (datetime.datetime.now() + datetime.timedelta(days=1)).strftime("%m/%d")
@@ -37,10 +72,11 @@ class PropScraper:
         """
         Creates a dictionary containing the links to current and historical props
         for every player in the NBA, organized by team
-        Links change daily -- No performance gain from saving directory as file since bs4 gets all links <1s
+        Always hits the network -- use load_webpage_directory for the cached copy
         """
         #         Load HTML into bs4
-        soup = BeautifulSoup(requests.get(self.directory_url).text, "html.parser")
+        with METRICS.span('directory_fetch'):
+            soup = BeautifulSoup(self._get(self.directory_url).text, "html.parser")
 
         #         Load each team data into dictionary, converting the full team name into initials as used in rest of data
         team_modules = {
@@ -64,6 +100,58 @@ class PropScraper:
 
         return webpage_directory
 
+    def load_webpage_directory(self) -> dict[str, dict[str, str]]:
+        """
+        Same as create_webpage_directory but served from today's on-disk copy when there is one
+        - Returned dict is updated in place by background refreshes
+        """
+        if not self.directory_cache:
+            return self.create_webpage_directory()
+        return self.directory_cache.load()
+
+    def refresh_webpage_directory(self) -> bool:
+        """Starts a background refetch of the directory if cached copy is past its ttl"""
+        return self.directory_cache.maybe_refresh() if self.directory_cache else False
+
+    def _get(self, url: str) -> requests.Response:
+        """Single point for all page fetches, goes through pooled session (keep-alive, timeouts, retries, politeness delay)"""
+        return self.session.get(url)
+
+    def _fetch_page(self, url: str) -> tuple[bytes, str]:
+        """
+        - Returns page content and its sha1
+        - With page cache: sends If-None-Match/If-Modified-Since and serves cached body on 304
+        - Timed as a 'fetch' span, failures counted as scrape_failures
+        """
+        try:
+            with METRICS.span('fetch', url=url):
+                return self._fetch_page_content(url)
+        except ScrapeRequestError:
+            METRICS.incr('scrape_failures', url=url)
+            raise
+
+    def _fetch_page_content(self, url: str) -> tuple[bytes, str]:
+        if not self.page_cache:
+            content = self._get(url).content
+            return content, hashlib.sha1(content).hexdigest()
+
+        response = self.session.get(url, headers=self.page_cache.conditional_headers(url))
+        if response.status_code == 304:
+            return self.page_cache.hit(url)
+
+        if response.status_code != 200:
+            return response.content, hashlib.sha1(response.content).hexdigest()
+
+        return response.content, self.page_cache.store(url, response.content, response.headers)
+
+    @property
+    def stats(self) -> dict[str, float]:
+        """Request/retry/failure counters and latency percentiles for every fetch so far, plus page cache hits"""
+        return {
+            **self.session.stats.summary(),
+            **(self.page_cache.summary() if self.page_cache else {}),
+        }
+
     def _past_week_date_strs(self, team: str|None = None) -> list[str,...]:
         """
         Return past week of datestrs in website form to determine if non-current dates
@@ -77,8 +165,8 @@ class PropScraper:
         )
 
 
-    def _parse_spans(self, possible_date_spans):
-        current_date_and_after = [possible_date_span.get_text() for possible_date_span in possible_date_spans[:100]] #soup.find_all("span")[18:]]
+    def _parse_spans(self, span_texts: list[str,...]):
+        current_date_and_after = span_texts[:100]
         msgs = []
         for idx, span_str in enumerate(current_date_and_after):
 
@@ -93,8 +181,8 @@ class PropScraper:
 
         return msgs
 
-    def _determine_next_date_index(self, possible_date_spans, skip: bool = False):
-        current_date_and_after = [possible_date_span.get_text() for possible_date_span in possible_date_spans[:200]] #soup.find_all("span")[18:]]
+    def _determine_next_date_index(self, span_texts: list[str,...], skip: bool = False):
+        current_date_and_after = span_texts[:200]
         original_index = 18
         idx = original_index
         for idx_, span_str in enumerate(current_date_and_after):
@@ -112,31 +200,25 @@ class PropScraper:
 
         return idx
 
-    def scrape_player_props(
-        self,
-        name: str,
-        url: str,
-        site: str,
-        team: str
-    ) -> tuple[float, float, str]:
-
-        # Load HTML
-        soup = BeautifulSoup(requests.get(url).text, "html.parser")
-        failed_scrape_return = (0.0, 0.0, '---')
+    def _select_props_rows(self, page: PropPage, team: str) -> tuple[str, list[list[str,...],...]]|None:
+        """
+        - Picks current (or fallback) props table off parsed page
+        - Returns (date_str, [[Category, Line, Over, Under], ...]) or None if nothing usable
+        """
         fallback = False # Tempermental ~ in progress but nullified in _past_week_date_strs being empty
 
-        try:
-            if not soup.find_all("span"):
-                return failed_scrape_return
-        except AttributeError:
-            return failed_scrape_return
+        if not page.spans:
+            return None
 
         #         Make sure current, adjust for weird site format
         zero_fill_date = lambda dp: f"0{dp}" if len(dp) == 1 else dp
-        date_str = "/".join([
-            zero_fill_date(date_part)
-            for date_part in soup.find_all("span")[18].get_text().split(" ")[1].split("/")
-        ])
+        try:
+            date_str = "/".join([
+                zero_fill_date(date_part)
+                for date_part in page.spans[18].split(" ")[1].split("/")
+            ])
+        except IndexError:
+            return None
 
         # Players who dont often have props but get them because of injuries will still be posted (and overweighted) for the next slate
         # No way to determine length of injuries affecting recent props though
@@ -150,69 +232,90 @@ class PropScraper:
             date_str != self.scoresandodds_date_str,
             not date_str in self._past_week_date_strs(team=team) 
         ]):
-            next_date_index = self._determine_next_date_index(soup.find_all('span'))
+            next_date_index = self._determine_next_date_index(page.spans)
             date_str = "/".join([
                 zero_fill_date(date_part)
-                for date_part in soup.find_all("span")[next_date_index].get_text().split(" ")[1].split("/")
+                for date_part in page.spans[next_date_index].split(" ")[1].split("/")
             ])
             fallback = True
+            METRICS.incr('fallback_date', team=team, date=date_str)
 
         if all([
             date_str != self.scoresandodds_date_str,
             not date_str in self._past_week_date_strs(team=team),
         ]):
-            return failed_scrape_return
+            return None
         
         try:
-            props_rows = soup.find("table", class_="sticky").find("tbody").find_all("tr")
-            if fallback:
-                props_rows = soup.find_all("table", class_="sticky")[1].find("tbody").find_all("tr")
+            props_rows = page.tables[1 if fallback else 0]
+            if page.tables[0] is None or props_rows is None:
+                return None
 
-        except (AttributeError, IndexError):
-            return failed_scrape_return
+        except IndexError:
+            return None
 
         prop_targets = ['Points', 'Rebounds', 'Assists', '3 Pointers', 'Steals', 'Blocks', 'Turnovers']
 
         # Form: Category Line Over Under
-        target_rows = [row for row in props_rows if row.find("td").get_text().strip() in prop_targets]
-
-        doubles = 0
-        doubles_implied_odds = []
-        props = []
-        for rowtags in target_rows:
-            info = [val.get_text().lower().strip() for val in rowtags.find_all('td')] # (Category, Line, Over, Under)
-            
-            stat = info[0]
-            value = float(info[1])
-
-            implied_odds_over = MoneyLine(info[2]).implied_probability
-            implied_odds_under = MoneyLine(info[3]).implied_probability
-
-            if value >= 9.5:
-                doubles += 1
-                doubles_implied_odds.append(implied_odds_over/sum([implied_odds_over, implied_odds_under]))
-                    
-            props.append(Prop(
-                name=name,
-                date_str=date_str,
-                stat=stat,
-                value=value,
-                implied_odds_over=implied_odds_over,
-                implied_odds_under=implied_odds_under,     
-            ))
+        return date_str, [row for row in props_rows if row[0] in prop_targets]
 
-        
-        player = Player(name=name, props=props, site=self.site)
-        fpts, e_fpts = player.fpts, player.e_fpts
-        
-        bonus = {2: 1.5, 3: 4.5}.get(doubles, 0.0)
-        if bonus:
-            fpts += bonus
-            
-            e_factor = 1.0
-            for implied_odds in doubles_implied_odds:
-                e_factor *= implied_odds
-            e_fpts += e_factor*bonus
-        
-        return fpts, e_fpts, player.shorthand
+    def _raw_player_props(self, name: str, content: bytes, team: str) -> list[dict[str,float|str],...]:
+        """Parses page into raw prop rows for projections.project_props: name, team, date, stat, line, over_odds, under_odds"""
+        with METRICS.span('parse', player=name):
+            page = parse_prop_page(content)
+        selected = self._select_props_rows(page, team)
+        if not selected:
+            return []
+
+        date_str, target_rows = selected
+        return [
+            {
+                'name': name,
+                'team': team,
+                'date': date_str,
+                'stat': row[0].lower(),
+                'line': float(row[1]),
+                'over_odds': MoneyLine(row[2]).moneyline,
+                'under_odds': MoneyLine(row[3]).moneyline,
+            }
+            for row in target_rows
+        ]
+
+    def scrape_raw_props(self, name: str, url: str, team: str) -> list[dict[str,float|str],...]:
+        """Fetch + parse only, no projection -> raw prop rows for the batch projection engine"""
+        try:
+            content, body_hash = self._fetch_page(url)
+        except ScrapeRequestError:
+            METRICS.incr('empty_results', player=name)
+            return []
+
+        cached = self._raw_parsed.get(url)
+        if cached and cached[0] == body_hash:
+            raw_rows = cached[1]
+        else:
+            raw_rows = self._raw_player_props(name, content, team)
+            self._raw_parsed[url] = (body_hash, raw_rows)
+
+        if not raw_rows:
+            METRICS.incr('empty_results', player=name)
+
+        return raw_rows
+
+    def scrape_slate_raw(self, players: list[tuple[str,str,str],...]) -> pd.DataFrame:
+        """
+        - Fans out scrape_raw_props across the slate on a bounded thread pool, players: [(name, url, team), ...]
+        - At most max_in_flight pages in flight at once, host_delay enforced between request starts
+        - Returns one long table of raw props for the whole slate, in input order
+        - Feed into projections.project_props to get fpts/e_fpts/props for every player at once
+        """
+        if not players:
+            return pd.DataFrame(columns=RAW_COLUMNS)
+
+        with ThreadPoolExecutor(max_workers=max(1, min(self.max_in_flight, len(players)))) as pool:
+            raw_rows = [
+                row
+                for rows in pool.map(lambda player: self.scrape_raw_props(*player), players)
+                for row in rows
+            ]
 
+        return pd.DataFrame(raw_rows, columns=RAW_COLUMNS)
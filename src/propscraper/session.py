@@ -0,0 +1,125 @@
+import time
+import random
+import threading
+import requests
+from requests.adapters import HTTPAdapter
+from dataclasses import dataclass, field
+
+from .throttle import HostThrottle
+from _errors import ScrapeRequestError
+
+# Statuses worth another attempt, anything else is returned as-is
+RETRY_STATUSES = (429, 500, 502, 503, 504)
+
+
+@dataclass
+class SessionStats:
+    """
+    Thread-safe counters for every fetch made through a ScraperSession
+    - latencies are per successful request (seconds, includes retries + backoff)
+    """
+    requests: int = 0
+    retries: int = 0
+    failures: int = 0
+    latencies: list[float,...] = field(default_factory=list)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def record(self, latency: float|None, retries: int) -> None:
+        with self._lock:
+            self.requests += 1
+            self.retries += retries
+            if latency is None:
+                self.failures += 1
+            else:
+                self.latencies.append(latency)
+
+    def reset(self) -> None:
+        with self._lock:
+            self.requests, self.retries, self.failures = 0, 0, 0
+            self.latencies = []
+
+    def summary(self) -> dict[str, float]:
+        with self._lock:
+            latencies = sorted(self.latencies)
+
+        percentile = lambda q: latencies[min(len(latencies) - 1, int(q * len(latencies)))] if latencies else 0.0
+
+        return {
+            'requests': self.requests,
+            'retries': self.retries,
+            'failures': self.failures,
+            'mean_latency': sum(latencies) / len(latencies) if latencies else 0.0,
+            'p50_latency': percentile(0.50),
+            'p99_latency': percentile(0.99),
+        }
+
+
+@dataclass
+class ScraperSession:
+    """
+    Pooled HTTP client shared by every fetch in PropScraper
+    - Keep-alive connections reused across players/threads (pool_size should cover max_in_flight)
+    - Timeouts on every request so one slow page can't stall a slate
+    - Retries connection errors, timeouts and RETRY_STATUSES with jittered exponential backoff
+    """
+    timeout: float = 10.0
+    max_retries: int = 3
+    backoff: float = 0.5
+    max_backoff: float = 8.0
+    pool_size: int = 16
+    throttle: HostThrottle|None = None
+
+    def __post_init__(self):
+        self.session = requests.Session()
+        adapter = HTTPAdapter(pool_connections=4, pool_maxsize=self.pool_size, max_retries=0)
+        self.session.mount('http://', adapter)
+        self.session.mount('https://', adapter)
+
+        self.stats = SessionStats()
+
+    def _sleep_before_retry(self, attempt: int, response: requests.Response|None = None) -> None:
+        """Full jitter backoff, respects numeric Retry-After when given"""
+        delay = random.uniform(0.0, min(self.max_backoff, self.backoff * 2**attempt))
+
+        retry_after = response.headers.get('Retry-After', '') if response is not None else ''
+        if retry_after.isdigit():
+            delay = max(delay, min(self.max_backoff, float(retry_after)))
+
+        time.sleep(delay)
+        return
+
+    def get(self, url: str, **kwargs) -> requests.Response:
+        """
+        GET with retries, raises ScrapeRequestError once all attempts are used up
+        """
+        kwargs.setdefault('timeout', self.timeout)
+        start = time.perf_counter()
+        reason = ''
+
+        for attempt in range(self.max_retries + 1):
+            if attempt:
+                self._sleep_before_retry(attempt - 1, response)
+
+            if self.throttle:
+                self.throttle.wait(url)
+
+            response = None
+            try:
+                response = self.session.get(url, **kwargs)
+            except (requests.ConnectionError, requests.Timeout) as err:
+                reason = type(err).__name__
+                continue
+
+            if response.status_code in RETRY_STATUSES:
+                reason = f'HTTP {response.status_code}'
+                continue
+
+            self.stats.record(time.perf_counter() - start, attempt)
+            return response
+
+        self.stats.record(None, self.max_retries)
+        raise ScrapeRequestError(url, reason)
+
+    def close(self) -> None:
+        self.session.close()
+        return
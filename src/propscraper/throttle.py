@@ -0,0 +1,31 @@
+import time
+import threading
+from urllib.parse import urlparse
+from dataclasses import dataclass, field
+
+
+@dataclass
+class HostThrottle:
+    """
+    Per-host politeness delay shared between scraping threads
+    - Every request to a host is given a start slot at least `delay` seconds after the previous one
+    - Slots are reserved under a lock but slept on outside of it so other hosts are never blocked
+    """
+    delay: float = 0.0
+    _next_slot: dict[str, float] = field(default_factory=dict, repr=False)
+    _lock: threading.Lock = field(default_factory=threading.Lock, repr=False)
+
+    def wait(self, url: str) -> None:
+        if self.delay <= 0.0:
+            return
+
+        host = urlparse(url).netloc
+        with self._lock:
+            now = time.monotonic()
+            slot = max(now, self._next_slot.get(host, now))
+            self._next_slot[host] = slot + self.delay
+
+        if slot > now:
+            time.sleep(slot - now)
+
+        return
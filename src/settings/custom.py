@@ -1,5 +1,4 @@
 import pandas as pd
-import matplotlib.pyplot as plt
 
 
 def pandas_settings() -> None:
@@ -13,6 +12,7 @@ def pandas_settings() -> None:
 
 
 def matplotlib_settings() -> None:
+    import matplotlib.pyplot as plt
     plt.style.use("fivethirtyeight")
 
     return
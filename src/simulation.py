@@ -0,0 +1,150 @@
+import math
+import numpy as np
+import pandas as pd
+
+from designs import SCORING, BONUS, DOUBLES_STATS, IMPUTE_PROPS
+from projections import project_prop_rows
+
+# 10+ in a DOUBLES_STATS category counts towards a double/triple-double
+DOUBLES_THRESHOLD = 10
+
+PERCENTILES = (10, 25, 50, 75, 90)
+
+# Largest count the Poisson fit ever has to sum up to (lines are well under this)
+MAX_COUNT = 128
+LOG_FACTORIALS = np.array([math.lgamma(count + 1) for count in range(MAX_COUNT + 1)])
+
+
+def _poisson_at_least(k: np.ndarray, lam: np.ndarray) -> np.ndarray:
+    """P(X >= k) for X ~ Poisson(lam), elementwise over matching arrays of k and lam"""
+    k = np.minimum(k.astype('int64'), MAX_COUNT)
+    width = max(int(k.max()) if k.size else 0, 1)
+    counts = np.arange(width)
+    lam = np.maximum(lam, 1e-12)[:, None]
+
+    below = np.exp(-lam + counts * np.log(lam) - LOG_FACTORIALS[counts]) * (counts < k[:, None])
+    return np.clip(1.0 - below.sum(axis=1), 0.0, 1.0)
+
+
+def fit_poisson_means(line: np.ndarray, p_over: np.ndarray, iterations: int = 60) -> np.ndarray:
+    """
+    Poisson mean per prop such that P(X > line) matches the de-vigged over probability
+    - Whole number lines treated as X >= line + 1 (pushes ignored)
+    - Bisection run on every prop at once, P(X > line) is increasing in the mean
+    """
+    k = np.floor(line) + 1
+    p_over = np.clip(p_over, 1e-6, 1 - 1e-6)
+    lo, hi = np.zeros_like(line, dtype='float64'), 3 * line + 10.0
+
+    for _ in range(iterations):
+        mid = (lo + hi) / 2
+        too_low = _poisson_at_least(k, mid) < p_over
+        lo = np.where(too_low, mid, lo)
+        hi = np.where(too_low, hi, mid)
+
+    return (lo + hi) / 2
+
+
+def _at_least_counts(probs: np.ndarray) -> np.ndarray:
+    """
+    Poisson-binomial: probs (players, categories) of each category hitting -> (players, categories + 1)
+    distribution of how many hit, exact dynamic programming over categories
+    """
+    dist = np.zeros((probs.shape[0], probs.shape[1] + 1))
+    dist[:, 0] = 1.0
+    for col in range(probs.shape[1]):
+        p = probs[:, col:col+1]
+        dist[:, 1:] = dist[:, 1:] * (1 - p) + dist[:, :-1] * p
+        dist[:, 0] = dist[:, 0] * (1 - p[:, 0])
+
+    return dist
+
+
+def _player_means(props: pd.DataFrame, stats: list[str,...]) -> tuple[pd.Index, np.ndarray]:
+    """Player x stat grid of Poisson means, IMPUTE_PROPS means for unlisted stats, 0 for the rest"""
+    props = (props
+        .loc[props.stat.isin(stats) & props.true_odds_over.notna()]
+        .drop_duplicates(['name', 'stat'], keep='last')
+    )
+    names = pd.Index(props.name.drop_duplicates(), name='name')
+
+    means = np.tile([IMPUTE_PROPS.get(stat_, 0.0) for stat_ in stats], (len(names), 1)).astype('float64')
+    means[names.get_indexer(props.name), [stats.index(stat_) for stat_ in props.stat]] = fit_poisson_means(
+        props.line.to_numpy(dtype='float64'),
+        props.true_odds_over.to_numpy(dtype='float64'),
+    )
+
+    return names, means
+
+
+def simulate_players(
+    props: pd.DataFrame,
+    site: str = 'draftkings',
+    n_samples: int = 10_000,
+    seed: int|None = None,
+    percentiles: tuple[int,...] = PERCENTILES,
+    chunk_size: int = 256,
+) -> pd.DataFrame:
+    """
+    Fantasy point distribution per player from project_prop_rows output
+    - Every listed stat ~ Poisson, mean fitted to its line + de-vigged over odds, stats independent
+    - Unlisted IMPUTE_PROPS stats ~ Poisson(IMPUTE_PROPS value), anything else unlisted scores 0 (same as project_players)
+    - n_samples draws per player, whole chunk_size block of players drawn as one array per stat
+    - Double/triple-double bonus applied per sample, dd_prob/td_prob/e_bonus are exact (Poisson-binomial), not sampled
+    - Index: name, in order of first appearance
+    """
+    columns = ['sim_mean', 'sim_std'] + [f'p{q}' for q in percentiles] + ['dd_prob', 'td_prob', 'e_bonus']
+    if props.empty:
+        return pd.DataFrame(columns=columns, index=pd.Index([], name='name'))
+
+    scoring = SCORING[site]
+    bonus = BONUS.get(site, {})
+    stats = list(scoring)
+    doubles = [stats.index(stat_) for stat_ in DOUBLES_STATS if stat_ in stats]
+
+    names, means = _player_means(props, stats)
+
+    hit = _poisson_at_least(
+        np.full(means[:, doubles].size, DOUBLES_THRESHOLD),
+        means[:, doubles].ravel(),
+    ).reshape(len(names), len(doubles))
+    n_hits = _at_least_counts(hit)
+    dd_prob, td_prob = n_hits[:, 2:].sum(axis=1), n_hits[:, 3:].sum(axis=1)
+
+    rng = np.random.default_rng(seed)
+    summary = np.empty((len(names), 2 + len(percentiles)))
+    for start in range(0, len(names), chunk_size):
+        block = means[start:start+chunk_size]
+        samples = np.zeros((len(block), n_samples))
+        n_doubles = np.zeros((len(block), n_samples), dtype='int8')
+
+        for col, stat_ in enumerate(stats):
+            if not scoring[stat_] and col not in doubles:
+                continue
+            if not block[:, col].any():
+                continue
+            draws = rng.poisson(block[:, col:col+1], size=(len(block), n_samples))
+            samples += scoring[stat_] * draws
+            if col in doubles:
+                n_doubles += draws >= DOUBLES_THRESHOLD
+
+        samples += bonus.get('double_double', 0.0) * (n_doubles >= 2) + bonus.get('triple_double', 0.0) * (n_doubles >= 3)
+
+        summary[start:start+len(block), 0] = samples.mean(axis=1)
+        summary[start:start+len(block), 1] = samples.std(axis=1)
+        summary[start:start+len(block), 2:] = np.percentile(samples, percentiles, axis=1).T
+
+    return (pd
+        .DataFrame(summary, columns=columns[:-3], index=names)
+        .assign(
+            dd_prob=dd_prob,
+            td_prob=td_prob,
+            e_bonus=bonus.get('double_double', 0.0) * dd_prob + bonus.get('triple_double', 0.0) * td_prob,
+        )
+        .round(3)
+    )
+
+
+def simulate_props(raw: pd.DataFrame, site: str = 'draftkings', **kwargs) -> pd.DataFrame:
+    """Raw prop lines for whole slate -> fpts distribution per player, kwargs go to simulate_players"""
+    return simulate_players(project_prop_rows(raw, site), site, **kwargs)